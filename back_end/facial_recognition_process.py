@@ -0,0 +1,228 @@
+"""Facial recognition running in a dedicated worker process (off the server's GIL)."""
+
+import logging
+import multiprocessing
+from multiprocessing import shared_memory
+import os
+import sys
+import threading
+from typing import Optional, Any, Set
+
+# Add back_end to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+log = logging.getLogger("FacialRecognitionProcess")
+
+# Largest frame that fits in the shared memory slot
+MAX_FRAME_SIZE = 5 * 1024 * 1024
+
+# Loading the InsightFace model in the worker can take a while, and on first run TensorRT builds
+# its engines before warmup finishes (minutes); override with FACE_STARTUP_TIMEOUT_SECONDS
+STARTUP_TIMEOUT_SECONDS = float(os.getenv("FACE_STARTUP_TIMEOUT_SECONDS", "900"))
+RESULT_TIMEOUT_SECONDS = 30.0
+
+
+def _recognition_process_main(conn, shm_name: str, cpus: Optional[Set[int]] = None, nice: Optional[int] = None) -> None:
+    """Worker process entry point: run frames from shared memory through the recognition service.
+    
+    Protocol over the pipe (parent -> worker):
+        ("frame", (seq, length)): frame bytes are in shared memory, reply with
+            ("result", (seq, person_id, switch_detected)); the parent matches results to frames by seq
+        ("invalidate", person_id): invalidate the worker's person name cache (no reply)
+        None: stop
+    
+    Args:
+        conn: Worker end of the pipe
+        shm_name: Name of the shared memory block holding the current frame
+        cpus: CPUs to restrict the worker to (None leaves its affinity alone)
+        nice: Nice value for the worker (None leaves its priority alone)
+    """
+    # Worker logs (this module's and the recognition service's) need a handler in this process
+    logging.basicConfig(level=logging.INFO, format="[%(name)s] %(message)s")
+    
+    # Applied before the model is loaded so the inference threads it starts inherit them
+    if cpus and hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, cpus)
+        except OSError as e:
+            log.warning("Could not set CPU affinity to %s: %s", sorted(cpus), e)
+    if nice is not None and hasattr(os, "setpriority"):
+        try:
+            os.setpriority(os.PRIO_PROCESS, 0, nice)
+        except OSError as e:
+            log.warning("Could not set nice value to %s: %s", nice, e)
+    
+    # Imported here (the module loads the model on import) so only the worker process loads it
+    from facial_recognition_service import FacialRecognitionService
+    
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        service = FacialRecognitionService()
+        service.warmup()
+        conn.send(("ready", None))
+        
+        while True:
+            message = conn.recv()
+            if message is None:
+                break
+            
+            kind, value = message
+            if kind == "frame":
+                seq, length = value
+                # Decode straight from shared memory instead of copying the frame out first. The
+                # parent doesn't write the slot again until it has received this frame's result (by
+                # seq), even after a result timeout, so the bytes can't change while in use here
+                frame = shm.buf[:length]
+                try:
+                    result = service.process_frame(frame)
+                except Exception as e:
+                    log.exception("Error processing frame: %s", e)
+                    result = (service.current_person_id, False)
+                finally:
+                    try:
+                        frame.release()
+                    except BufferError:
+                        # Still referenced somewhere; it goes away with its last reference
+                        pass
+                conn.send(("result", (seq,) + tuple(result)))
+            elif kind == "invalidate":
+                service.invalidate_person_name_cache(value)
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        shm.close()
+
+
+class FacialRecognitionProcess:
+    """Drop-in replacement for FacialRecognitionService.process_frame backed by a worker process.
+    
+    Recognition is CPU-bound (JPEG decode + InsightFace), so running it in its own process keeps it
+    from competing with the frame reader thread and the asyncio loop for the GIL. The recognition
+    service is stateful (frame history, current person), so there is exactly one worker process.
+    Frames are handed over through a shared memory slot; only the length crosses the pipe. Each
+    frame carries a sequence number and the slot is not written again until the worker has
+    returned the result for the frame in it, even if waiting for that result timed out.
+    """
+    
+    def __init__(self, database_manager: Optional[Any] = None, cpus: Optional[Set[int]] = None, nice: Optional[int] = None):
+        """Start the recognition worker process and wait until its model is loaded.
+        
+        Args:
+            database_manager: Database manager for lookups in this process (the worker opens its own)
+            cpus: CPUs to restrict the worker process to (None: inherit this thread's affinity)
+            nice: Nice value for the worker process (None: inherit this thread's priority)
+        
+        Raises:
+            RuntimeError: If the worker process fails to start in time
+        """
+        self.database_manager = database_manager
+        self.current_person_id: Optional[str] = None
+        
+        context = multiprocessing.get_context("spawn")
+        self._shm = shared_memory.SharedMemory(create=True, size=MAX_FRAME_SIZE)
+        self._conn, child_conn = context.Pipe()
+        self._frame_lock = threading.Lock()  # One frame in flight at a time
+        self._send_lock = threading.Lock()
+        self._seq = 0  # Sequence number of the last frame sent
+        self._unacked_seq: Optional[int] = None  # Frame still in the slot (its result hasn't come back)
+        
+        self._process = context.Process(
+            target=_recognition_process_main,
+            args=(child_conn, self._shm.name, cpus, nice),
+            name="FacialRecognitionProcess",
+            daemon=True
+        )
+        try:
+            self._process.start()
+            child_conn.close()
+            
+            if not self._conn.poll(STARTUP_TIMEOUT_SECONDS):
+                raise RuntimeError("Timed out waiting for facial recognition process to start")
+            self._conn.recv()
+        except Exception:
+            self.close()
+            raise
+    
+    def process_frame(self, image_data: bytes) -> tuple[Optional[str], bool]:
+        """Process a frame in the worker process.
+        
+        Args:
+            image_data: Binary image data (JPEG/PNG)
+        
+        Returns:
+            Tuple of (person_id, switch_detected), same as FacialRecognitionService.process_frame
+        """
+        frame_len = len(image_data) if image_data else 0
+        if frame_len == 0:
+            log.warning("Empty image data in process_frame")
+            return (self.current_person_id, False)
+        
+        if frame_len > MAX_FRAME_SIZE:
+            log.warning("Frame too large (%s bytes), skipping", frame_len)
+            return (self.current_person_id, False)
+        
+        with self._frame_lock:
+            if self._unacked_seq is not None:
+                # A previous wait timed out: collect its result if it has arrived meanwhile
+                while self._unacked_seq is not None and self._conn.poll():
+                    _, (seq, person_id, switch_detected) = self._conn.recv()
+                    if seq == self._unacked_seq:
+                        self._unacked_seq = None
+                        if switch_detected:
+                            # The worker switched person on that frame: report it now (this frame is
+                            # skipped, the next one goes through)
+                            self.current_person_id = person_id
+                            return (person_id, True)
+                if self._unacked_seq is not None:
+                    # The worker may still be reading the slot, so this frame is skipped
+                    return (self.current_person_id, False)
+            
+            self._shm.buf[:frame_len] = image_data
+            self._seq += 1
+            seq = self._seq
+            self._unacked_seq = seq
+            with self._send_lock:
+                self._conn.send(("frame", (seq, frame_len)))
+            
+            while True:
+                if not self._conn.poll(RESULT_TIMEOUT_SECONDS):
+                    raise TimeoutError("Facial recognition process did not respond")
+                _, (result_seq, person_id, switch_detected) = self._conn.recv()
+                if result_seq == seq:
+                    break
+            self._unacked_seq = None
+        
+        self.current_person_id = person_id
+        return (person_id, switch_detected)
+    
+    def invalidate_person_name_cache(self, person_id: Optional[str] = None) -> None:
+        """Invalidate the worker's person name cache.
+        
+        Args:
+            person_id: Specific person ID to invalidate, or None to clear all
+        """
+        try:
+            with self._send_lock:
+                self._conn.send(("invalidate", person_id))
+        except (OSError, ValueError) as e:
+            log.error("Error invalidating person name cache: %s", e)
+    
+    def close(self) -> None:
+        """Stop the worker process and release the shared memory slot."""
+        try:
+            with self._send_lock:
+                self._conn.send(None)
+        except (OSError, ValueError):
+            pass
+        
+        if self._process.pid is not None:
+            self._process.join(timeout=2.0)
+            if self._process.is_alive():
+                self._process.terminate()
+        
+        self._conn.close()
+        self._shm.close()
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
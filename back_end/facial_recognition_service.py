@@ -3,11 +3,14 @@
 import cv2
 import numpy as np
 import insightface
+import onnxruntime
 from insightface.app import FaceAnalysis
+from insightface.app.common import Face
 from typing import Optional, Dict, Any, List
 import sys
 import os
 import time
+import logging
 from datetime import datetime
 
 # Add parent directory to path for imports
@@ -15,11 +18,44 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from speech.conversation.database import DatabaseManager
 
+log = logging.getLogger("FacialRecognition")
+
+# libjpeg-turbo bindings for faster JPEG decoding (optional, falls back to OpenCV)
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR
+    TURBO_JPEG = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    # OSError/RuntimeError: package installed but libturbojpeg shared library not found
+    TURBO_JPEG = None
+
+
+def _onnx_providers() -> list:
+    """Pick ONNX Runtime execution providers for the face models, fastest available first.
+    
+    TensorRT runs the models in FP16 and caches built engines on disk (ONNX Runtime keys the
+    cache by model and GPU), CUDA is the GPU fallback, and the CPU provider is always last.
+    """
+    available = onnxruntime.get_available_providers()
+    providers = []
+    if "TensorrtExecutionProvider" in available:
+        cache_dir = os.getenv("FACE_TRT_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".trt_cache"))
+        providers.append(("TensorrtExecutionProvider", {
+            "trt_fp16_enable": True,
+            "trt_engine_cache_enable": True,
+            "trt_engine_cache_path": cache_dir,
+        }))
+    if "CUDAExecutionProvider" in available:
+        providers.append("CUDAExecutionProvider")
+    providers.append("CPUExecutionProvider")
+    return providers
+
+
 # Initialize InsightFace model globally
-print("[FacialRecognition] Initializing InsightFace Model...")
-FACE_APP = FaceAnalysis()
-FACE_APP.prepare(ctx_id=-1)  # CPU
-print("[FacialRecognition] InsightFace Model Ready.")
+log.info("Initializing InsightFace Model...")
+FACE_PROVIDERS = _onnx_providers()
+FACE_APP = FaceAnalysis(providers=FACE_PROVIDERS)
+FACE_APP.prepare(ctx_id=0 if len(FACE_PROVIDERS) > 1 else -1)  # GPU if available, else CPU
+log.info("InsightFace Model Ready.")
 
 # Match threshold for face recognition
 MATCH_THRESHOLD = 0.2  # Cosine Similarity
@@ -27,6 +63,47 @@ MATCH_THRESHOLD = 0.2  # Cosine Similarity
 # Detection confidence threshold for face detection
 DETECTION_CONFIDENCE_THRESHOLD = 0.75  # Minimum confidence score for face detection
 
+# Frames whose 64-bit dHash differs from the last recognized frame in at most this many bits
+# reuse its result instead of running the model again
+NEAR_DUPLICATE_MAX_DISTANCE = 3
+
+# A detected face whose box overlaps the last recognized face by at least this IoU is treated as
+# the same person (tracked) without running the recognition model, for up to TRACK_MAX_AGE_SECONDS
+TRACK_IOU_THRESHOLD = 0.5
+TRACK_MAX_AGE_SECONDS = 2.0
+
+# Five-point face landmarks (ArcFace alignment template) for the warm-up run of the recognition model
+WARMUP_KPS = np.array([
+    [38.2946, 51.6963], [73.5318, 51.5014], [56.0252, 71.7366], [41.5493, 92.3655], [70.7299, 92.2041]
+], dtype=np.float32)
+
+
+def _frame_dhash(image_data: bytes) -> Optional[int]:
+    """Compute a 64-bit difference hash of a frame (cheap: decodes at 1/8 scale in grayscale).
+    
+    Args:
+        image_data: Binary image data (JPEG/PNG)
+        
+    Returns:
+        Hash as an int, or None if the frame could not be decoded
+    """
+    small = cv2.imdecode(np.frombuffer(image_data, np.uint8), cv2.IMREAD_REDUCED_GRAYSCALE_8)
+    if small is None or small.size == 0:
+        return None
+    small = cv2.resize(small, (9, 8), interpolation=cv2.INTER_AREA)
+    return int.from_bytes(np.packbits(small[:, 1:] > small[:, :-1]).tobytes(), "big")
+
+
+def _box_iou(a: np.ndarray, b: np.ndarray) -> float:
+    """Intersection over union of two (x1, y1, x2, y2) boxes."""
+    inter_w = min(a[2], b[2]) - max(a[0], b[0])
+    inter_h = min(a[3], b[3]) - max(a[1], b[1])
+    if inter_w <= 0 or inter_h <= 0:
+        return 0.0
+    inter = inter_w * inter_h
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return float(inter / union) if union > 0 else 0.0
+
 
 class FacialRecognitionService:
     """Service for facial recognition with person switching logic."""
@@ -42,13 +119,20 @@ class FacialRecognitionService:
             try:
                 self.database_manager = DatabaseManager()
             except Exception as e:
-                print(f"[FacialRecognition] Warning: Database not available: {e}")
+                log.warning("Database not available: %s", e)
                 self.database_manager = None
         
         # Person switching state
         self.frame_history: List[Optional[str]] = []  # Frame results (person_id or None)
         self.current_person_id: Optional[str] = None
         
+        # Last frame that went through the model and its result (for skipping near-identical frames)
+        self._last_frame_hash: Optional[int] = None
+        self._last_frame_person_id: Optional[str] = None
+        
+        # Tracked face: (box, person_id, time it was last recognized)
+        self._track: Optional[tuple[np.ndarray, str, float]] = None
+        
         # FPS tracking for dynamic thresholds
         self.frame_timestamps: List[float] = []  # Timestamps of recent frames for FPS calculation
         self.fps_window_size = 30  # Number of frames to use for FPS calculation
@@ -66,6 +150,9 @@ class FacialRecognitionService:
         self._face_database_cache: Optional[Dict[str, np.ndarray]] = None
         self._face_database_cache_time: float = 0.0
         self._face_database_cache_ttl: float = 5.0  # Reload cache every 5 seconds
+        # Matching bank built from the cached database: (database it was built from, person_ids,
+        # matrix of their L2-normalized embeddings, one row per person_id)
+        self._face_bank: Optional[tuple[Dict[str, np.ndarray], List[str], np.ndarray]] = None
         
         # Cache person names to avoid repeated database queries
         self._person_name_cache: Dict[str, str] = {}
@@ -79,78 +166,132 @@ class FacialRecognitionService:
         Returns:
             Face embedding array or None if no face found
         """
+        img = self._decode_image(image_data)
+        if img is None:
+            return None
+        
+        face = self._detect_face(img)
+        if face is None:
+            return None
+        
+        return self._embed_face(img, face)
+    
+    def _decode_image(self, image_data: bytes) -> Optional[np.ndarray]:
+        """Decode image bytes to a BGR array.
+        
+        Args:
+            image_data: Binary image data (JPEG/PNG)
+            
+        Returns:
+            Decoded image or None if it could not be decoded
+        """
         if not image_data or len(image_data) == 0:
-            print("[FacialRecognition] ❌ Empty image data provided")
+            log.error("❌ Empty image data provided")
             return None
         
         try:
-            # Decode image from bytes
-            try:
-                nparr = np.frombuffer(image_data, np.uint8)
-                if len(nparr) == 0:
-                    print("[FacialRecognition] ❌ Empty image buffer")
-                    return None
-            except (ValueError, TypeError) as e:
-                print(f"[FacialRecognition] ❌ Error creating numpy array from image data: {e}")
+            nparr = np.frombuffer(image_data, np.uint8)
+            if len(nparr) == 0:
+                log.error("❌ Empty image buffer")
                 return None
+        except (ValueError, TypeError) as e:
+            log.error("❌ Error creating numpy array from image data: %s", e)
+            return None
+        except Exception as e:
+            log.error("❌ Unexpected error creating numpy array: %s", e)
+            return None
+        
+        img = None
+        if TURBO_JPEG is not None and image_data[:2] == b"\xff\xd8":
+            try:
+                img = TURBO_JPEG.decode(image_data, pixel_format=TJPF_BGR)
             except Exception as e:
-                print(f"[FacialRecognition] ❌ Unexpected error creating numpy array: {e}")
-                return None
-            
+                log.warning("TurboJPEG decode failed, falling back to OpenCV: %s", e)
+        
+        if img is None:
             try:
                 img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
             except Exception as e:
-                print(f"[FacialRecognition] ❌ Error decoding image with OpenCV: {e}")
-                return None
-            
-            if img is None:
-                print("[FacialRecognition] ❌ Failed to decode image")
-                return None
-            
-            if img.size == 0:
-                print("[FacialRecognition] ❌ Decoded image is empty")
+                log.error("❌ Error decoding image with OpenCV: %s", e)
                 return None
+        
+        if img is None:
+            log.error("❌ Failed to decode image")
+            return None
+        
+        if img.size == 0:
+            log.error("❌ Decoded image is empty")
+            return None
+        
+        return img
+    
+    def _detect_face(self, img: np.ndarray) -> Optional[Face]:
+        """Run face detection only and return the primary face.
+        
+        Args:
+            img: Decoded BGR image
             
-            # Detect faces and get embedding
-            try:
-                faces = FACE_APP.get(img)
-            except Exception as e:
-                print(f"[FacialRecognition] ❌ Error detecting faces: {e}")
-                import traceback
-                traceback.print_exc()
-                return None
+        Returns:
+            Primary detected face (bbox, kps, det_score), or None if none passes the confidence threshold
+        """
+        try:
+            bboxes, kpss = FACE_APP.det_model.detect(img, max_num=0, metric="default")
+        except Exception as e:
+            log.exception("❌ Error detecting faces: %s", e)
+            return None
+        
+        if bboxes.shape[0] == 0:
+            return None
+        
+        # Same face FaceAnalysis.get would list first
+        det_score = bboxes[0, 4]
+        if det_score < DETECTION_CONFIDENCE_THRESHOLD:
+            return None
+        
+        return Face(bbox=bboxes[0, 0:4], kps=kpss[0] if kpss is not None else None, det_score=det_score)
+    
+    def _embed_face(self, img: np.ndarray, face: Face) -> Optional[np.ndarray]:
+        """Run the recognition model on a detected face.
+        
+        Args:
+            img: Decoded BGR image
+            face: Face returned by _detect_face
             
-            if faces and len(faces) > 0:
-                try:
-                    # Check detection confidence score
-                    det_score = faces[0].det_score
-                    print(f"AAAAAAAAAAA [FacialRecognition] Detection confidence score: {det_score}")
-                    
-                    # Filter by confidence threshold
-                    if det_score < DETECTION_CONFIDENCE_THRESHOLD:
-                        return None
-                    
-                    embedding = faces[0].embedding
-                    if embedding is None or len(embedding) == 0:
-                        return None
-                    
-                    return embedding
-                except (AttributeError, IndexError) as e:
-                    print(f"[FacialRecognition] ❌ Error accessing face data: {e}")
-                    return None
-                except Exception as e:
-                    print(f"[FacialRecognition] ❌ Error processing face: {e}")
-                    import traceback
-                    traceback.print_exc()
-                    return None
-            else:
+        Returns:
+            Face embedding array or None on failure
+        """
+        try:
+            FACE_APP.models["recognition"].get(img, face)
+            embedding = face.embedding
+            if embedding is None or len(embedding) == 0:
                 return None
+            return embedding
         except Exception as e:
-            print(f"[FacialRecognition] ❌ Unexpected error extracting embedding: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("❌ Error processing face: %s", e)
             return None
     
+    def _tracked_person_id(self, bbox: np.ndarray) -> Optional[str]:
+        """Return the tracked person's ID if bbox continues the tracked face.
+        
+        Args:
+            bbox: Box of the face detected in the current frame
+            
+        Returns:
+            Tracked person_id, or None if the face has to be recognized
+        """
+        if self._track is None:
+            return None
+        
+        track_bbox, person_id, recognized_at = self._track
+        if time.monotonic() - recognized_at > TRACK_MAX_AGE_SECONDS:
+            return None
+        if _box_iou(track_bbox, bbox) < TRACK_IOU_THRESHOLD:
+            return None
+        
+        # Follow the face as it moves
+        self._track = (bbox, person_id, recognized_at)
+        return person_id
+    
     def load_face_database_from_db(self, force_reload: bool = False) -> Dict[str, np.ndarray]:
         """Load face embeddings from PostgreSQL database (with caching).
         
@@ -175,7 +316,7 @@ class FacialRecognitionService:
         database = {}
         
         if not self.database_manager:
-            print("[FacialRecognition] No database manager available")
+            log.info("No database manager available")
             return database
         
         conn = None
@@ -184,7 +325,7 @@ class FacialRecognitionService:
             try:
                 conn = self.database_manager._get_connection()
             except Exception as e:
-                print(f"[FacialRecognition] Error getting database connection: {e}")
+                log.error("Error getting database connection: %s", e)
                 return database
             
             try:
@@ -192,13 +333,13 @@ class FacialRecognitionService:
                     try:
                         cur.execute("SELECT person_id, embedding FROM faces WHERE embedding IS NOT NULL")
                     except Exception as e:
-                        print(f"[FacialRecognition] Error executing database query: {e}")
+                        log.error("Error executing database query: %s", e)
                         return database
                     
                     try:
                         rows = cur.fetchall()
                     except Exception as e:
-                        print(f"[FacialRecognition] Error fetching database rows: {e}")
+                        log.error("Error fetching database rows: %s", e)
                         return database
                     
                     for person_id, embedding_bytes in rows:
@@ -212,29 +353,27 @@ class FacialRecognitionService:
                                 if len(embedding) > 0:
                                     database[person_id] = embedding
                                 else:
-                                    print(f"[FacialRecognition] Warning: Empty embedding for person_id {person_id}")
+                                    log.warning("Empty embedding for person_id %s", person_id)
                             except (ValueError, TypeError) as e:
-                                print(f"[FacialRecognition] Error converting embedding bytes for person_id {person_id}: {e}")
+                                log.error("Error converting embedding bytes for person_id %s: %s", person_id, e)
                                 continue
                             except Exception as e:
-                                print(f"[FacialRecognition] Unexpected error processing embedding for person_id {person_id}: {e}")
+                                log.error("Unexpected error processing embedding for person_id %s: %s", person_id, e)
                                 continue
             finally:
                 if conn:
                     try:
                         self.database_manager._return_connection(conn)
                     except Exception as e:
-                        print(f"[FacialRecognition] Error returning database connection: {e}")
+                        log.error("Error returning database connection: %s", e)
         except Exception as e:
-            print(f"[FacialRecognition] Error loading face database: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Error loading face database: %s", e)
         
         # Update cache
         load_end_time = time.time()
         load_duration = (load_end_time - load_start_time) * 1000
         if load_duration > 100:  # Only log if slow (>100ms)
-            print(f"[FacialRecognition] load_face_database_from_db() took {load_duration:.1f}ms (loaded {len(database)} embeddings)")
+            log.info("load_face_database_from_db() took %.1fms (loaded %s embeddings)", load_duration, len(database))
         
         self._face_database_cache = database
         self._face_database_cache_time = current_time
@@ -251,49 +390,64 @@ class FacialRecognitionService:
         Returns:
             Tuple of (best_match_person_id, similarity_score) or (None, -1) if no match
         """
-        best_match_id = None
-        best_score = -1.0
-        
         if not database:
             return None, -1.0
         
         if new_embedding is None or len(new_embedding) == 0:
-            print("[FacialRecognition] Warning: Empty embedding provided for matching")
+            log.warning("Empty embedding provided for matching")
             return None, -1.0
         
         try:
             new_norm = np.linalg.norm(new_embedding)
             if new_norm == 0:
-                print("[FacialRecognition] Warning: Zero-norm embedding provided")
+                log.warning("Zero-norm embedding provided")
                 return None, -1.0
         except Exception as e:
-            print(f"[FacialRecognition] Error calculating embedding norm: {e}")
+            log.error("Error calculating embedding norm: %s", e)
             return None, -1.0
         
-        for person_id, db_embedding in database.items():
-            if db_embedding is None or len(db_embedding) == 0:
-                continue
+        # Cosine similarity against every person at once: one matrix-vector product over
+        # pre-normalized embeddings, rebuilt only when the database cache is reloaded
+        bank = self._face_bank
+        if bank is None or bank[0] is not database or bank[2].shape[1] != len(new_embedding):
+            bank = self._build_face_bank(database, len(new_embedding))
+        _, person_ids, bank_matrix = bank
+        if not person_ids:
+            return None, -1.0
+        
+        try:
+            scores = bank_matrix @ (new_embedding / new_norm)
+        except (ValueError, TypeError) as e:
+            log.error("Error calculating similarity: %s", e)
+            return None, -1.0
+        
+        best_index = int(np.argmax(scores))
+        return person_ids[best_index], float(scores[best_index])
+    
+    def _build_face_bank(self, database: Dict[str, np.ndarray], dim: int) -> tuple[Dict[str, np.ndarray], List[str], np.ndarray]:
+        """Build the matching bank for a loaded face database.
+        
+        Args:
+            database: Dictionary of person_id -> embedding
+            dim: Embedding size (entries of a different size or with zero norm can't match and are left out)
             
-            try:
-                # Calculate cosine similarity
-                db_norm = np.linalg.norm(db_embedding)
-                if db_norm == 0:
-                    continue
-                
-                dot_product = np.dot(new_embedding, db_embedding)
-                score = dot_product / (new_norm * db_norm)
-                
-                if score > best_score:
-                    best_score = score
-                    best_match_id = person_id
-            except (ValueError, TypeError) as e:
-                print(f"[FacialRecognition] Error calculating similarity for person_id {person_id}: {e}")
+        Returns:
+            (database, person_ids, normalized embedding matrix), also stored as the current bank
+        """
+        person_ids = []
+        rows = []
+        for person_id, db_embedding in database.items():
+            if db_embedding is None or len(db_embedding) != dim:
                 continue
-            except Exception as e:
-                print(f"[FacialRecognition] Unexpected error matching person_id {person_id}: {e}")
+            db_norm = np.linalg.norm(db_embedding)
+            if db_norm == 0:
                 continue
+            person_ids.append(person_id)
+            rows.append(db_embedding / db_norm)
         
-        return best_match_id, float(best_score)
+        bank_matrix = np.vstack(rows).astype(np.float32, copy=False) if rows else np.empty((0, dim), dtype=np.float32)
+        self._face_bank = (database, person_ids, bank_matrix)
+        return self._face_bank
     
     def recognize_person(self, image_data: bytes) -> Optional[str]:
         """Recognize person from image data. Auto-creates new person if face detected but not matched.
@@ -305,16 +459,30 @@ class FacialRecognitionService:
             person_id if recognized or newly created, None if no face detected
         """
         if not image_data or len(image_data) == 0:
-            print("[FacialRecognition] Warning: Empty image data in recognize_person")
+            log.warning("Empty image data in recognize_person")
+            return None
+        
+        # Detect first; the recognition model only runs for faces that aren't already tracked
+        try:
+            img = self._decode_image(image_data)
+            face = self._detect_face(img) if img is not None else None
+        except Exception as e:
+            log.exception("Error detecting face: %s", e)
+            return None
+        
+        if face is None:
+            self._track = None
             return None
         
+        tracked_person_id = self._tracked_person_id(face.bbox)
+        if tracked_person_id is not None:
+            return tracked_person_id
+        
         # Extract embedding
         try:
-            embedding = self.get_embedding_from_image_data(image_data)
+            embedding = self._embed_face(img, face)
         except Exception as e:
-            print(f"[FacialRecognition] Error getting embedding: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Error getting embedding: %s", e)
             return None
         
         if embedding is None:
@@ -324,16 +492,14 @@ class FacialRecognitionService:
         try:
             database = self.load_face_database_from_db(force_reload=False)
         except Exception as e:
-            print(f"[FacialRecognition] Error loading face database: {e}")
+            log.error("Error loading face database: %s", e)
             database = {}
         
         # Find best match
         try:
             best_match_id, best_score = self.find_best_match(embedding, database)
         except Exception as e:
-            print(f"[FacialRecognition] Error finding best match: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Error finding best match: %s", e)
             best_match_id = None
             best_score = -1.0
         
@@ -351,9 +517,10 @@ class FacialRecognitionService:
                     # First time seeing this person in this session, initialize with current embedding
                     self.embedding_averages[best_match_id] = (embedding.copy(), 1)
             except Exception as e:
-                print(f"[FacialRecognition] Error updating embedding average: {e}")
+                log.error("Error updating embedding average: %s", e)
                 # Continue anyway - return the matched person_id
             
+            self._track = (face.bbox, best_match_id, time.monotonic())
             return best_match_id
         
         # No match found - create new person entry
@@ -362,7 +529,7 @@ class FacialRecognitionService:
             try:
                 new_person_id = f"Unnamed_{uuid.uuid4().hex[:8]}"
             except Exception as e:
-                print(f"[FacialRecognition] Error generating UUID: {e}")
+                log.error("Error generating UUID: %s", e)
                 return None
             # Save to database (async/non-blocking - don't wait for completion)
             if self.database_manager:
@@ -385,9 +552,10 @@ class FacialRecognitionService:
                     # Initialize average for this new person
                     self.embedding_averages[new_person_id] = (embedding.copy(), 1)
                 except Exception as e:
-                    print(f"[FacialRecognition] Error saving new person to database: {e}")
+                    log.error("Error saving new person to database: %s", e)
                     # Continue - return the new person_id anyway
             
+            self._track = (face.bbox, new_person_id, time.monotonic())
             return new_person_id
         
         # No match found and couldn't create new person
@@ -497,24 +665,36 @@ class FacialRecognitionService:
             - switch_detected: True if person switch was detected, False otherwise
         """
         if not image_data or len(image_data) == 0:
-            print("[FacialRecognition] Warning: Empty image data in process_frame")
+            log.warning("Empty image data in process_frame")
             return (self.current_person_id, False)
         
         try:
-            # Recognize person in frame (auto-creates if new face detected)
             try:
-                person_id = self.recognize_person(image_data)
+                frame_hash = _frame_dhash(image_data)
             except Exception as e:
-                print(f"[FacialRecognition] Error recognizing person: {e}")
-                import traceback
-                traceback.print_exc()
-                return (self.current_person_id, False)
+                log.error("Error hashing frame: %s", e)
+                frame_hash = None
+            
+            if (frame_hash is not None and self._last_frame_hash is not None
+                    and (frame_hash ^ self._last_frame_hash).bit_count() <= NEAR_DUPLICATE_MAX_DISTANCE):
+                # Scene hasn't changed since the last recognized frame: reuse its result
+                # (still counted in the frame history below so switch timing is unchanged)
+                person_id = self._last_frame_person_id
+            else:
+                # Recognize person in frame (auto-creates if new face detected)
+                try:
+                    person_id = self.recognize_person(image_data)
+                except Exception as e:
+                    log.exception("Error recognizing person: %s", e)
+                    return (self.current_person_id, False)
+                self._last_frame_hash = frame_hash
+                self._last_frame_person_id = person_id
             
             # Update frame history
             try:
                 self.update_frame_history(person_id)
             except Exception as e:
-                print(f"[FacialRecognition] Error updating frame history: {e}")
+                log.error("Error updating frame history: %s", e)
                 # Continue - history update failure shouldn't stop processing
             
             # Check for person switch
@@ -527,7 +707,7 @@ class FacialRecognitionService:
                             try:
                                 self._save_averaged_embedding(self.current_person_id)
                             except Exception as e:
-                                print(f"[FacialRecognition] Error saving averaged embedding: {e}")
+                                log.error("Error saving averaged embedding: %s", e)
                             
                             # Get person name for display
                             try:
@@ -539,7 +719,7 @@ class FacialRecognitionService:
                             self.current_person_id = None
                             return (None, True)  # Switch to no person detected
                     except Exception as e:
-                        print(f"[FacialRecognition] Error checking switch to no person: {e}")
+                        log.error("Error checking switch to no person: %s", e)
                 
                 # Case 2: Switch to different person (threshold-based, target: 0.5s)
                 elif person_id is not None:
@@ -551,7 +731,7 @@ class FacialRecognitionService:
                                     try:
                                         self._save_averaged_embedding(self.current_person_id)
                                     except Exception as e:
-                                        print(f"[FacialRecognition] Error saving averaged embedding: {e}")
+                                        log.error("Error saving averaged embedding: %s", e)
                                 
                                 # Get person names for display
                                 try:
@@ -568,7 +748,7 @@ class FacialRecognitionService:
                                 self.current_person_id = person_id
                                 return (person_id, True)  # Switch to person detected
                         except Exception as e:
-                            print(f"[FacialRecognition] Error checking switch to different person: {e}")
+                            log.error("Error checking switch to different person: %s", e)
                     elif self.current_person_id is None and person_id is not None:
                         # Switch from no person to person (threshold-based, target: 0.5s)
                         try:
@@ -582,18 +762,14 @@ class FacialRecognitionService:
                                 self.current_person_id = person_id
                                 return (person_id, True)  # Switch to person detected
                         except Exception as e:
-                            print(f"[FacialRecognition] Error checking switch from no person: {e}")
+                            log.error("Error checking switch from no person: %s", e)
             except Exception as e:
-                print(f"[FacialRecognition] Error in person switch logic: {e}")
-                import traceback
-                traceback.print_exc()
+                log.exception("Error in person switch logic: %s", e)
             
             # No switch detected
             return (self.current_person_id, False)
         except Exception as e:
-            print(f"[FacialRecognition] Fatal error in process_frame: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Fatal error in process_frame: %s", e)
             return (self.current_person_id, False)
     
     def _get_person_name(self, person_id: Optional[str]) -> Optional[str]:
@@ -633,6 +809,24 @@ class FacialRecognitionService:
         else:
             self._person_name_cache.clear()
     
+    def warmup(self, runs: int = 3) -> None:
+        """Run the detection and recognition models on a blank frame a few times.
+        
+        The first inferences pay for ONNX Runtime session warm-up (and TensorRT engine builds on
+        GPU); doing it here keeps that cost out of the first real frame.
+        
+        Args:
+            runs: Number of warm-up passes
+        """
+        img = np.zeros((480, 640, 3), dtype=np.uint8)
+        try:
+            for _ in range(runs):
+                FACE_APP.det_model.detect(img, max_num=0, metric="default")
+                face = Face(bbox=np.array([0, 0, 112, 112], dtype=np.float32), kps=WARMUP_KPS, det_score=1.0)
+                FACE_APP.models["recognition"].get(img, face)
+        except Exception as e:
+            log.warning("Model warm-up failed: %s", e)
+    
     def _save_averaged_embedding(self, person_id: str) -> None:
         """Save the averaged embedding for a person to the database.
         
@@ -648,11 +842,11 @@ class FacialRecognitionService:
         try:
             avg_embedding, count = self.embedding_averages[person_id]
         except (KeyError, ValueError) as e:
-            print(f"[FacialRecognition] Error accessing embedding average: {e}")
+            log.error("Error accessing embedding average: %s", e)
             return
         
         if avg_embedding is None or len(avg_embedding) == 0:
-            print(f"[FacialRecognition] Warning: Empty embedding for person_id {person_id}")
+            log.warning("Empty embedding for person_id %s", person_id)
             return
         
         if self.database_manager:
@@ -661,7 +855,7 @@ class FacialRecognitionService:
                 embedding_bytes = avg_embedding.tobytes()
                 
                 if not embedding_bytes or len(embedding_bytes) == 0:
-                    print(f"[FacialRecognition] Warning: Empty embedding bytes for person_id {person_id}")
+                    log.warning("Empty embedding bytes for person_id %s", person_id)
                     return
                 
                 # Update face record in database with averaged embedding
@@ -671,7 +865,5 @@ class FacialRecognitionService:
                     count=count
                 )
             except Exception as e:
-                print(f"[FacialRecognition] Error saving averaged embedding to database: {e}")
-                import traceback
-                traceback.print_exc()
+                log.exception("Error saving averaged embedding to database: %s", e)
 
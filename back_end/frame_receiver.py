@@ -2,24 +2,29 @@
 
 import sys
 import os
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 # Add back_end to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from facial_recognition_service import FacialRecognitionService
 from speech.conversation.database import DatabaseManager
 
+if TYPE_CHECKING:
+    from facial_recognition_service import FacialRecognitionService
+
 
 # Global service instance (initialized on first use)
-_facial_recognition_service: Optional[FacialRecognitionService] = None
+_facial_recognition_service: Optional["FacialRecognitionService"] = None
 
 
-def _get_service() -> FacialRecognitionService:
+def _get_service() -> "FacialRecognitionService":
     """Get or create facial recognition service instance."""
     global _facial_recognition_service
     
     if _facial_recognition_service is None:
+        # Imported on first use: the module loads the face model on import (vision/setup.py,
+        # and through it the server, import this module without running recognition here)
+        from facial_recognition_service import FacialRecognitionService
         try:
             database_manager = DatabaseManager()
             _facial_recognition_service = FacialRecognitionService(database_manager=database_manager)
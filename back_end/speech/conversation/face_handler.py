@@ -3,14 +3,16 @@
 import sys
 import os
 from datetime import datetime
-from typing import Optional, Callable
+from typing import TYPE_CHECKING, Optional, Callable
 
 # Add back_end to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from facial_recognition_service import FacialRecognitionService
 from .database import DatabaseManager
 
+if TYPE_CHECKING:
+    from facial_recognition_service import FacialRecognitionService
+
 
 class FaceHandler:
     """Face recognition handler using FacialRecognitionService.
@@ -44,7 +46,10 @@ class FaceHandler:
                 print(f"[FaceHandler] Warning: Database not available: {e}")
                 database_manager = None
         
-        self.facial_recognition_service = FacialRecognitionService(database_manager=database_manager)
+        # Created on the first frame: importing facial_recognition_service loads the face model,
+        # which the server (recognizing in its own worker process) never needs here
+        self.database_manager = database_manager
+        self.facial_recognition_service: Optional["FacialRecognitionService"] = None
         
         # Track previous person for detecting person lost events
         self._previous_person_id: Optional[str] = None
@@ -73,7 +78,12 @@ class FaceHandler:
             return None
         
         if not self.facial_recognition_service:
-            return None
+            try:
+                from facial_recognition_service import FacialRecognitionService
+                self.facial_recognition_service = FacialRecognitionService(database_manager=self.database_manager)
+            except Exception as e:
+                print(f"[FaceHandler] Error: Failed to initialize facial recognition service: {e}")
+                return None
         
         try:
             # Process frame through facial recognition service
@@ -34,8 +34,9 @@ class ConversationOrchestrator:
             model: LLM model identifier
             database_manager: Optional database manager (creates new one if not provided)
         """
-        # Initialize database manager
+        # Initialize database manager (only close it on stop if we created it)
         self.database_manager = database_manager
+        self._owns_database_manager = database_manager is None
         if self.database_manager is None:
             try:
                 self.database_manager = DatabaseManager()
@@ -75,6 +76,7 @@ class ConversationOrchestrator:
         # Callbacks for WebSocket communication
         self.on_notification: Optional[Callable[[str, str], None]] = None
         self.on_person_switch: Optional[Callable[[Optional[str], Optional[str], Optional[str]], None]] = None
+        self.on_summary_saved: Optional[Callable[[str], None]] = None
         self._previous_person_id: Optional[str] = None
         
         # Running state
@@ -84,16 +86,20 @@ class ConversationOrchestrator:
     def set_callbacks(
         self,
         on_notification: Optional[Callable[[str, str], None]] = None,
-        on_person_switch: Optional[Callable[[Optional[str], Optional[str], Optional[str]], None]] = None
+        on_person_switch: Optional[Callable[[Optional[str], Optional[str], Optional[str]], None]] = None,
+        on_summary_saved: Optional[Callable[[str], None]] = None
     ) -> None:
         """Set callbacks for notifications and person switches.
         
         Args:
             on_notification: Callback called with (title, message) when notification tool is used
             on_person_switch: Callback called with (person_id, person_name, recap) when person changes
+            on_summary_saved: Callback called with (person_id) after a new summary is saved for a person
+                (from a background thread)
         """
         self.on_notification = on_notification
         self.on_person_switch = on_person_switch
+        self.on_summary_saved = on_summary_saved
         
         # Also set notification callback in the tool
         if on_notification:
@@ -262,6 +268,13 @@ class ConversationOrchestrator:
                             
                             print(f"[Orchestrator] [Background] Summary generated: {summary_text[:100] if summary_text else 'None'}...")
                             
+                            # Recaps built before this summary existed are now stale
+                            if summary_text and self.on_summary_saved:
+                                try:
+                                    self.on_summary_saved(previous_person_id)
+                                except Exception as e:
+                                    print(f"[Orchestrator] ❌ Warning: Error in on_summary_saved callback: {e}")
+                            
                             # Update faces table with recap (latest summary)
                             if summary_text:
                                 try:
@@ -497,8 +510,8 @@ class ConversationOrchestrator:
                 import traceback
                 traceback.print_exc()
         
-        # Close database connection
-        if self.database_manager:
+        # Close database connection (shared managers are closed by their owner)
+        if self.database_manager and self._owns_database_manager:
             try:
                 self.database_manager.close()
             except Exception as e:
@@ -2,37 +2,73 @@
 
 import asyncio
 import json
+import logging
+import logging.handlers
 import os
 import sys
+import signal
 import socket
 import struct
 import threading
 import queue
 import time
-from typing import Dict, Optional, Callable
+from collections import deque
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Optional, Callable, Tuple, Union
 from dotenv import load_dotenv
 
 try:
     import websockets
-    from websockets import serve
-    from websockets.legacy.server import WebSocketServerProtocol
+    # The asyncio implementation (websockets >= 13), not the legacy one: its receive path hands
+    # messages over through a deque and a future instead of a chain of queue/lock round trips
+    from websockets.asyncio.server import serve, broadcast, ServerConnection
     WEBSOCKETS_AVAILABLE = True
 except ImportError:
     WEBSOCKETS_AVAILABLE = False
 
+try:
+    # Faster JSON serialization for outbound payloads
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+try:
+    # libuv-based event loop (not available on Windows)
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    uvloop = None
+    UVLOOP_AVAILABLE = False
+
+try:
+    import cv2
+    import numpy as np
+    CV2_AVAILABLE = True
+except ImportError:
+    cv2 = None
+    np = None
+    CV2_AVAILABLE = False
+
 # Add back_end to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from speech.conversation.orchestrator import ConversationOrchestrator
 from speech.conversation.database import DatabaseManager
 from speech.conversation.summarizer import ConversationSummarizer
-from facial_recognition_service import FacialRecognitionService
+# Importing facial_recognition_service loads the face model, so it is only imported for the
+# in-process fallback (normally recognition runs in FacialRecognitionProcess's worker)
+from facial_recognition_process import FacialRecognitionProcess
+
+if TYPE_CHECKING:
+    from facial_recognition_service import FacialRecognitionService
 
 # Import ESP32 connection functions from vision setup
 vision_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "vision")
 sys.path.insert(0, vision_path)
 try:
-    from setup import get_local_ip, _recv_exact
+    from setup import get_local_ip
     from voxel_sdk.device_controller import DeviceController
     from voxel_sdk.ble import BleVoxelTransport
     ESP32_IMPORTS_AVAILABLE = True
@@ -42,8 +78,6 @@ except ImportError as e:
     # Create dummy functions to prevent errors
     def get_local_ip():
         return "127.0.0.1"
-    def _recv_exact(conn, length):
-        return b""
     class DeviceController:
         pass
     class BleVoxelTransport:
@@ -51,6 +85,317 @@ except ImportError as e:
 
 load_dotenv()
 
+# Server and recognition worker logs; records are formatted and written by a background
+# listener (see _start_log_listener), which also takes the recognition service's and the
+# recognition process client's logs
+log = logging.getLogger("WebSocket")
+worker_log = logging.getLogger("FaceRecognitionWorker")
+service_log = logging.getLogger("FacialRecognition")
+process_log = logging.getLogger("FacialRecognitionProcess")
+
+# Throttling for the per-frame / per-recognition status lines
+LOG_EVERY_N_FRAMES = 30
+LOG_EVERY_N_RECOGNITIONS = 10
+
+
+def _dumps(obj) -> str:
+    """Serialize a message to JSON text (orjson when available).
+    
+    Always returns str: clients only parse text frames.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj)
+
+
+def _loads(message):
+    """Parse a JSON message (orjson when available).
+    
+    Raises:
+        json.JSONDecodeError: If the message is not valid JSON (orjson's error subclasses it)
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(message)
+    return json.loads(message)
+
+
+# Connections in the shared database pool: it serves every client orchestrator, the face
+# recognition worker, recap threads and change_name writes (checkouts past this wait)
+DATABASE_POOL_SIZE = int(os.getenv("WS_DATABASE_POOL_SIZE", "20"))
+
+# How long cached person name/recap lookups stay valid
+PERSON_CACHE_TTL_SECONDS = 60.0
+
+# Pre-serialized control responses (sent as text frames, clients only parse text)
+PONG_MESSAGE = _dumps({"type": "pong"})
+INVALID_FORMAT_MESSAGE = _dumps({"type": "error", "message": "Invalid message format"})
+MISSING_TYPE_MESSAGE = _dumps({"type": "error", "message": "Missing 'type' field"})
+MISSING_NEW_NAME_MESSAGE = _dumps({"type": "error", "message": "Missing new_name parameter"})
+NO_PERSON_MESSAGE = _dumps({"type": "error", "message": "No person_id or person_name provided"})
+NO_DATABASE_MESSAGE = _dumps({"type": "error", "message": "Database manager not available"})
+
+# Per-connection outbound queue bound (for slow clients the oldest queued sends are dropped beyond this)
+OUTBOUND_QUEUE_SIZE = 256
+
+# ESP32 stream framing limits and socket tuning
+MAX_FRAME_SIZE = 5 * 1024 * 1024
+JPEG_SOI = b"\xff\xd8"  # JPEG start-of-image marker
+FRAME_MAGIC = b"VXL0"
+_FRAME_LENGTH = struct.Struct(">I")  # Big-endian payload length at header offset 4
+ESP32_RCVBUF_SIZE = 2 * 1024 * 1024
+ESP32_READ_TIMEOUT_SECONDS = 5.0
+# Frames are parsed out of one receive buffer with room for two maximum-size frames
+ESP32_RX_BUFFER_SIZE = 2 * MAX_FRAME_SIZE
+# Oversize frames are read and dropped in chunks to stay in sync with the stream;
+# beyond MAX_DISCARD_SIZE the length is treated as corrupt instead
+DISCARD_CHUNK_SIZE = 64 * 1024
+MAX_DISCARD_SIZE = 64 * 1024 * 1024
+# Linux-only socket option (None elsewhere)
+TCP_QUICKACK = getattr(socket, "TCP_QUICKACK", None)
+
+# Opt-in (Linux): pin the event loop thread (which also reads ESP32 frames) and face recognition
+# (the worker process, or the worker thread when recognition runs in-process) to separate cores,
+# and raise recognition's priority
+PIN_CPUS = os.getenv("WS_PIN_CPUS", "0") == "1"
+RECOGNITION_WORKER_NICE = -5  # Needs CAP_SYS_NICE (or root); left unchanged otherwise
+
+
+class _RecvBuffer:
+    """Receive buffer for a non-blocking stream socket.
+    
+    Each refill reads as much as the socket has ready into one large buffer, so a header and its
+    payload (and often the next header) arrive in a single recv instead of one recv each. Records
+    are handed out as views into the buffer; a view stays valid until the next read. Quick ACKs
+    are re-armed after every recv where supported.
+    """
+    
+    def __init__(self, size: int):
+        """Allocate the buffer.
+        
+        Args:
+            size: Buffer size in bytes (must hold the largest record that will be read)
+        """
+        self._view = memoryview(bytearray(size))
+        self._start = 0  # Read cursor
+        self._end = 0  # Write cursor
+    
+    async def read_exact(self, loop: asyncio.AbstractEventLoop, conn: socket.socket, length: int) -> memoryview:
+        """Return the next length bytes of the stream, receiving more only when short.
+        
+        Args:
+            loop: Running event loop
+            conn: Connected non-blocking socket
+            length: Number of bytes to read (at most the buffer size)
+            
+        Returns:
+            View of the bytes read (shorter than length only if the peer closed the connection)
+        """
+        view = self._view
+        if self._end - self._start < length:
+            if self._start + length > len(view):
+                # Not enough room after the read cursor: move the unread bytes to the front
+                pending = self._end - self._start
+                view[:pending] = view[self._start:self._end]
+                self._start, self._end = 0, pending
+            while self._end - self._start < length:
+                received = await loop.sock_recv_into(conn, view[self._end:])
+                if not received:
+                    break
+                if TCP_QUICKACK is not None:
+                    _rearm_quickack(conn)
+                self._end += received
+        
+        start = self._start
+        length = min(length, self._end - start)
+        self._start += length
+        if self._start == self._end:
+            # Drained: rewind so the next refill gets the whole buffer
+            self._start = self._end = 0
+        return view[start:start + length]
+    
+    async def discard(self, loop: asyncio.AbstractEventLoop, conn: socket.socket, length: int) -> None:
+        """Read and drop exactly length bytes of the stream.
+        
+        Args:
+            loop: Running event loop
+            conn: Connected non-blocking socket
+            length: Number of bytes to drop
+        
+        Raises:
+            ConnectionError: If the peer closed the connection first
+        """
+        while length > 0:
+            received = len(await self.read_exact(loop, conn, min(DISCARD_CHUNK_SIZE, length)))
+            if not received:
+                raise ConnectionError("ESP32 stream closed while discarding frame")
+            length -= received
+
+
+def _reencode_as_jpeg(payload: memoryview) -> Optional[bytes]:
+    """Decode a non-JPEG ESP32 frame and re-encode it as JPEG for recognition.
+    
+    Args:
+        payload: Encoded frame (e.g. PNG)
+        
+    Returns:
+        JPEG bytes, or None if the frame could not be decoded/encoded
+    """
+    frame_array = np.frombuffer(payload, dtype=np.uint8)
+    if len(frame_array) == 0:
+        return None
+    image = cv2.imdecode(frame_array, cv2.IMREAD_COLOR)
+    if image is None:
+        return None
+    success, encoded = cv2.imencode('.jpg', image)
+    if not success or encoded is None:
+        return None
+    return encoded.tobytes()
+
+
+def _tune_esp32_socket(conn: socket.socket) -> None:
+    """Apply receive-side socket options to the ESP32 stream listener or accepted connection.
+    
+    Enlarges the receive buffer for bursts. The stream only flows from the device, so send-side
+    options such as TCP_NODELAY would have no effect here (Nagle runs on the ESP32). Quick ACKs
+    are not set here: Linux clears TCP_QUICKACK after use, so _RecvBuffer re-arms it after each read.
+    
+    Args:
+        conn: ESP32 listener socket (accepted sockets inherit the options) or accepted socket
+    """
+    try:
+        conn.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, ESP32_RCVBUF_SIZE)
+    except OSError as e:
+        log.warning("Could not set SO_RCVBUF on ESP32 socket: %s", e)
+
+
+def _rearm_quickack(conn: socket.socket) -> None:
+    """Turn quick ACKs back on for a connected socket (Linux only; the kernel clears the flag after use).
+    
+    Keeps delayed ACKs from stalling the device's sends between frames.
+    
+    Args:
+        conn: Connected socket
+    """
+    try:
+        conn.setsockopt(socket.IPPROTO_TCP, TCP_QUICKACK, 1)
+    except OSError:
+        pass
+
+
+def _set_thread_affinity(cpus) -> None:
+    """Restrict the calling thread (and threads/processes it starts afterwards) to the given CPUs.
+    
+    Args:
+        cpus: CPU numbers to allow
+    """
+    if not hasattr(os, "sched_setaffinity"):
+        return
+    try:
+        # pid 0 is the calling thread on Linux
+        os.sched_setaffinity(0, cpus)
+    except OSError as e:
+        log.warning("Could not set CPU affinity to %s: %s", sorted(cpus), e)
+
+
+def _set_thread_nice(nice: int) -> None:
+    """Set the calling thread's nice value (Linux nice values are per thread).
+    
+    Args:
+        nice: Nice value (negative raises priority)
+    """
+    if not hasattr(os, "setpriority"):
+        return
+    try:
+        # PRIO_PROCESS with who=0 is the calling thread on Linux
+        os.setpriority(os.PRIO_PROCESS, 0, nice)
+    except OSError as e:
+        log.warning("Could not set thread nice value to %s: %s", nice, e)
+
+
+def _on_loop_thread(loop: asyncio.AbstractEventLoop) -> bool:
+    """Whether the calling thread is running the given event loop."""
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
+
+
+def _start_log_listener() -> logging.handlers.QueueListener:
+    """Route the server logs through a queue so formatting and stderr writes happen off the hot threads.
+    
+    Returns:
+        Started listener (stop it on shutdown to flush pending records)
+    """
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("[%(name)s] %(message)s"))
+    
+    log_queue: queue.Queue = queue.Queue(-1)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    for logger in (log, worker_log, service_log, process_log):
+        logger.addHandler(queue_handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    return listener
+
+
+def _describe_connection(websocket) -> str:
+    """Printable "ip:port" label for a websocket connection (for log lines).
+    
+    Args:
+        websocket: WebSocket connection
+        
+    Returns:
+        "ip:port", or "unknown" if the remote address is not available
+    """
+    # Remote address may not be available during handshake
+    try:
+        remote_addr = websocket.remote_address
+        if remote_addr:
+            return f"{remote_addr[0]}:{remote_addr[1]}"
+    except Exception:
+        pass
+    return "unknown"
+
+
+@lru_cache(maxsize=64)
+def _person_switch_message(
+    person_id: Optional[str],
+    person_name: Optional[str],
+    recap: Optional[str]
+) -> Tuple[str, str]:
+    """Build (and memoize) the serialized switch_interaction_person message.
+    
+    Switches usually repeat the same few people and every switch is broadcast to every
+    client, so the same payload is reused instead of re-serialized per send.
+    
+    Args:
+        person_id: Person ID (None if no person detected)
+        person_name: Person name (from database lookup)
+        recap: Recap text displayed as description on lines 2-3
+        
+    Returns:
+        Tuple of (display_name, JSON message)
+    """
+    # Differentiate between "no person detected" and "unknown person detected"
+    if person_id is None:
+        # No person detected
+        display_name = "No person detected"
+    else:
+        # Person detected - use person_name or "Unknown" if not set
+        display_name = person_name or "Unknown"
+    
+    payload = {
+        "type": "switch_interaction_person",
+        "person_id": person_id,
+        "person_name": str(display_name),
+        "blurb": f"Last seen: 5 min ago" if not recap else None,  # Fallback if no recap
+        "recap": str(recap) if recap else None  # Description/recap to display on lines 2-3
+    }
+    return display_name, _dumps(payload)
+
 
 class WebSocketServer:
     """WebSocket server that handles audio streaming from Mentra app and ESP32 facial recognition."""
@@ -70,28 +415,98 @@ class WebSocketServer:
         
         self.host = host
         self.port = port
-        self.connections: Dict[str, Dict] = {}  # connection_id -> {ws, orchestrator}
+        self.connections: Dict[int, Dict] = {}  # connection_id (id(websocket)) -> {ws, orchestrator}
+        # Immutable (connection_id, conn_info) snapshot, rebuilt only on connect/disconnect.
+        # Readers (worker thread, broadcasts) iterate it without copying or racing dict mutation.
+        self._connections_snapshot: Tuple[Tuple[int, Dict], ...] = ()
+        # Websockets of the same snapshot, ready to hand to broadcast
+        self._websockets_snapshot: Tuple[ServerConnection, ...] = ()
         
         # ESP32 connection state
         self.esp32_controller: Optional[DeviceController] = None
         self.esp32_conn: Optional[socket.socket] = None
-        self.esp32_stream_thread: Optional[threading.Thread] = None
+        # ESP32 frame reader task (runs on the event loop) and a flag set once it has finished
+        self._esp32_frames_task: Optional[asyncio.Task] = None
+        self._esp32_frames_done = threading.Event()
+        self._esp32_frames_done.set()
         self.esp32_stop_flag = threading.Event()
         
+        # Shared database manager (one connection pool for all clients, created lazily)
+        self.database_manager: Optional[DatabaseManager] = None
+        self._database_manager_lock = threading.Lock()
+        
         # Facial recognition service
-        self.facial_recognition_service: Optional[FacialRecognitionService] = None
+        self.facial_recognition_service: Optional[Union["FacialRecognitionService", FacialRecognitionProcess]] = None
         
-        # Face recognition processing queue and worker thread (non-blocking)
-        self.face_recognition_queue: Optional[queue.Queue] = None
+        # Latest frame awaiting face recognition (latest wins: a newer frame replaces one not yet
+        # picked up) and the worker thread that processes it
+        self._latest_frame: Optional[bytes] = None
+        self._latest_frame_lock = threading.Lock()
+        self._latest_frame_ready = threading.Event()
+        self._dropped_frames = 0
         self.face_recognition_thread: Optional[threading.Thread] = None
         
         # Summarizer for generating recaps (initialized when needed)
         self.summarizer: Optional[ConversationSummarizer] = None
         
-        # Queue for person switch notifications from background thread
-        self.person_switch_queue: Optional[asyncio.Queue] = None
+        # Cache person lookups on switch: person_id -> (name, recap, expiry). Filled by the
+        # recognition worker thread and invalidated from the event loop, so guarded by a lock
+        self._person_cache: Dict[str, Tuple[str, Optional[str], float]] = {}
+        self._person_cache_lock = threading.Lock()
+        # Summaries saved per person_id; a recap generated from an older count is stale (guarded
+        # by _person_cache_lock)
+        self._summary_generations: Dict[str, int] = {}
+        # Person IDs with a recap being generated (added by the worker thread, removed by the recap
+        # thread; guarded by _person_cache_lock)
+        self._recaps_in_flight: set = set()
+        
+        # Pending person switch from background thread (latest wins) and its wakeup event
+        self._pending_person_switch: deque = deque(maxlen=1)
+        self._person_switch_ready: Optional[asyncio.Event] = None
+        
+        # CPU pinning when WS_PIN_CPUS=1: (all allowed CPUs, loop CPUs, face recognition CPUs)
+        self._cpu_affinity: Optional[Tuple[set, set, set]] = None
+        
+        # Set to shut the server down (see request_stop)
+        self._stop_event: Optional[asyncio.Event] = None
+        # Background log writer (started by run); flushed before a forced exit
+        self._log_listener: Optional[logging.handlers.QueueListener] = None
         self.main_event_loop: Optional[asyncio.AbstractEventLoop] = None
         
+        # Control message type -> handler
+        self._control_handlers = {
+            "ping": self._on_ping,
+            "set_interaction_id": self._on_set_interaction_id,
+            "change_name": self._on_change_name,
+        }
+    
+    def _get_database_manager(self) -> Optional[DatabaseManager]:
+        """Get the shared database manager, creating it on first use.
+        
+        Returns:
+            Shared DatabaseManager instance, or None if the database is not available
+        """
+        if self.database_manager is not None:
+            return self.database_manager
+        
+        with self._database_manager_lock:
+            if self.database_manager is None:
+                try:
+                    self.database_manager = DatabaseManager(max_connections=DATABASE_POOL_SIZE)
+                except Exception as e:
+                    log.warning("Database not available: %s", e)
+            return self.database_manager
+    
+    def _close_database_manager(self) -> None:
+        """Close the shared database manager (on shutdown, after its users have stopped)."""
+        with self._database_manager_lock:
+            database_manager, self.database_manager = self.database_manager, None
+        if database_manager is not None:
+            try:
+                database_manager.close()
+            except Exception as e:
+                log.error("Error closing database manager: %s", e)
+    
     def setup_esp32_connection(self) -> bool:
         """Set up ESP32 connection (BLE, WiFi, stream).
         
@@ -99,35 +514,33 @@ class WebSocketServer:
             True if connection successful, False otherwise
         """
         if not ESP32_IMPORTS_AVAILABLE:
-            print("[WebSocket] ❌ ESP32 imports not available, cannot connect to ESP32")
+            log.error("❌ ESP32 imports not available, cannot connect to ESP32")
             return False
         
         transport = None
         listener = None
         
         try:
-            print("[WebSocket] ===== Setting up ESP32 connection =====")
+            log.info("===== Setting up ESP32 connection =====")
             
             # Step 1: Connect via Bluetooth
             ble_name = "voxel"
             target_address = ""
             
             try:
-                print(f"[WebSocket] Step 1: Connecting via Bluetooth (scanning for '{ble_name}')...")
+                log.info("Step 1: Connecting via Bluetooth (scanning for '%s')...", ble_name)
                 transport = BleVoxelTransport(device_name=ble_name)
-                print("[WebSocket] BLE transport created, attempting connection...")
+                log.info("BLE transport created, attempting connection...")
                 transport.connect(target_address)
-                print("[WebSocket] BLE connection established!")
+                log.info("BLE connection established!")
             except Exception as e:
-                print(f"[WebSocket] ❌ BLE connection failed: {e}")
-                import traceback
-                traceback.print_exc()
+                log.exception("❌ BLE connection failed: %s", e)
                 return False
             
             try:
                 self.esp32_controller = DeviceController(transport)
             except Exception as e:
-                print(f"[WebSocket] ❌ Failed to create device controller: {e}")
+                log.error("❌ Failed to create device controller: %s", e)
                 try:
                     transport.disconnect()
                 except Exception:
@@ -139,55 +552,56 @@ class WebSocketServer:
                 info = self.esp32_controller.execute_device_command("get_device_name")
                 if isinstance(info, dict):
                     device_name = info.get("device_name", "voxel")
-                    print(f"[WebSocket] Connected to device '{device_name}'.")
+                    log.info("Connected to device '%s'.", device_name)
             except Exception as e:
-                print(f"[WebSocket] Warning: Could not get device name: {e}")
-                print("[WebSocket] Connected to device.")
+                log.warning("Could not get device name: %s", e)
+                log.info("Connected to device.")
             
             # Step 2: Connect to WiFi
             try:
-                print("\n[WebSocket] Connecting to WiFi...")
+                log.info("Connecting to WiFi...")
                 #wifi_response = self.esp32_controller.execute_device_command("connectWifi:bfjnkasdbkasvbu|adamantium")
                 wifi_response = self.esp32_controller.execute_device_command("connectWifi:ApamDaGoat|apamthegoat")
                 
                 if isinstance(wifi_response, dict):
                     if "error" in wifi_response:
-                        print(f"[WebSocket] ❌ WiFi Connection Failed: {wifi_response.get('error')}")
+                        log.error("❌ WiFi Connection Failed: %s", wifi_response.get('error'))
                         return False
                     else:
-                        print("[WebSocket] ✅ WiFi Connected Successfully")
+                        log.info("✅ WiFi Connected Successfully")
                         if "ip" in wifi_response:
-                            print(f"[WebSocket]    Device IP: {wifi_response['ip']}")
+                            log.info("   Device IP: %s", wifi_response['ip'])
                         if "ssid" in wifi_response:
-                            print(f"[WebSocket]    SSID: {wifi_response['ssid']}")
+                            log.info("   SSID: %s", wifi_response['ssid'])
                 else:
-                    print(f"[WebSocket] Warning: Unexpected WiFi response format: {type(wifi_response)}")
+                    log.warning("Unexpected WiFi response format: %s", type(wifi_response))
             except Exception as e:
-                print(f"[WebSocket] ❌ WiFi connection error: {e}")
-                import traceback
-                traceback.print_exc()
+                log.exception("❌ WiFi connection error: %s", e)
                 return False
             
             # Step 3: Start streaming
             try:
-                print("\n[WebSocket] Starting stream on port 9000...")
+                log.info("Starting stream on port 9000...")
                 local_ip = get_local_ip()
                 stream_port = 9000
                 
-                print(f"[WebSocket] 📡 Stream IP: {local_ip}:{stream_port}")
+                log.info("📡 Stream IP: %s:%s", local_ip, stream_port)
                 
                 # Set up listener socket
                 try:
                     listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
                     listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                    # Set before listen() so the accepted socket advertises the larger window
+                    # (and window scale) from the handshake on; setting it after accept is too late
+                    _tune_esp32_socket(listener)
                     listener.bind(("", stream_port))
                     listener.listen(1)
-                    print(f"[WebSocket]    ✓ Listener socket ready on port {stream_port}")
+                    log.info("   ✓ Listener socket ready on port %s", stream_port)
                 except OSError as e:
-                    print(f"[WebSocket] ❌ Failed to bind listener socket: {e}")
+                    log.error("❌ Failed to bind listener socket: %s", e)
                     return False
                 except Exception as e:
-                    print(f"[WebSocket] ❌ Error setting up listener socket: {e}")
+                    log.error("❌ Error setting up listener socket: %s", e)
                     return False
                 
                 # Start the stream on the device
@@ -198,24 +612,23 @@ class WebSocketServer:
                         if listener:
                             listener.close()
                         error_msg = stream_response.get('error', 'Unknown error')
-                        print(f"[WebSocket] ❌ Stream Failed: {error_msg}")
+                        log.error("❌ Stream Failed: %s", error_msg)
                         return False
                 except Exception as e:
                     if listener:
                         listener.close()
-                    print(f"[WebSocket] ❌ Error starting stream: {e}")
-                    import traceback
-                    traceback.print_exc()
+                    log.exception("❌ Error starting stream: %s", e)
                     return False
                 
-                print("[WebSocket] ✅ Stream started successfully")
-                print(f"[WebSocket]    Waiting for device to connect...")
+                log.info("✅ Stream started successfully")
+                log.info("   Waiting for device to connect...")
                 
                 # Wait for device to connect
                 try:
                     listener.settimeout(10.0)
                     self.esp32_conn, addr = listener.accept()
-                    print(f"[WebSocket]    ✓ Device connected from {addr}")
+                    log.info("   ✓ Device connected from %s", addr)
+                    _tune_esp32_socket(self.esp32_conn)
                     listener.close()
                     listener = None
                 except socket.timeout:
@@ -225,7 +638,7 @@ class WebSocketServer:
                         self.esp32_controller.filesystem.stop_rdmp_stream()
                     except Exception:
                         pass
-                    print("[WebSocket]    ❌ Timeout waiting for device connection")
+                    log.error("   ❌ Timeout waiting for device connection")
                     return False
                 except Exception as e:
                     if listener:
@@ -234,7 +647,7 @@ class WebSocketServer:
                         self.esp32_controller.filesystem.stop_rdmp_stream()
                     except Exception:
                         pass
-                    print(f"[WebSocket] ❌ Error accepting device connection: {e}")
+                    log.error("❌ Error accepting device connection: %s", e)
                     return False
                 
             except Exception as e:
@@ -243,32 +656,45 @@ class WebSocketServer:
                         listener.close()
                     except Exception:
                         pass
-                print(f"[WebSocket] ❌ Error in streaming setup: {e}")
-                import traceback
-                traceback.print_exc()
+                log.exception("❌ Error in streaming setup: %s", e)
                 return False
             
-            # Initialize facial recognition service
+            # Initialize facial recognition in a dedicated process (keeps recognition off this process's GIL)
+            try:
+                self.facial_recognition_service = FacialRecognitionProcess(
+                    database_manager=self._get_database_manager(),
+                    cpus=self._cpu_affinity[2] if self._cpu_affinity else None,
+                    nice=RECOGNITION_WORKER_NICE if self._cpu_affinity else None
+                )
+                log.info("Facial recognition process started")
+                return True
+            except Exception as e:
+                log.warning("Failed to start facial recognition process, running in-process: %s", e)
+            
+            # Fall back to in-process facial recognition service
+            try:
+                from facial_recognition_service import FacialRecognitionService
+            except Exception as e:
+                log.error("❌ Failed to load facial recognition service: %s", e)
+                return False
             try:
-                database_manager = DatabaseManager()
+                database_manager = self._get_database_manager()
+                if database_manager is None:
+                    raise ConnectionError("Database not available")
                 self.facial_recognition_service = FacialRecognitionService(database_manager=database_manager)
-                print("[WebSocket] Facial recognition service initialized")
+                log.info("Facial recognition service initialized")
             except Exception as e:
-                print(f"[WebSocket] Warning: Failed to initialize facial recognition service: {e}")
-                import traceback
-                traceback.print_exc()
+                log.exception("Failed to initialize facial recognition service: %s", e)
                 try:
                     self.facial_recognition_service = FacialRecognitionService(database_manager=None)
                 except Exception as e2:
-                    print(f"[WebSocket] ❌ Failed to initialize facial recognition service even without database: {e2}")
+                    log.error("❌ Failed to initialize facial recognition service even without database: %s", e2)
                     return False
             
             return True
             
         except Exception as e:
-            print(f"[WebSocket] Fatal error setting up ESP32 connection: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Fatal error setting up ESP32 connection: %s", e)
             # Cleanup
             if listener:
                 try:
@@ -288,18 +714,34 @@ class WebSocketServer:
                     pass
             return False
     
-    def _process_esp32_frames(self):
-        """Process frames from ESP32 stream in background thread."""
-        if not self.esp32_conn:
-            return
-        
-        print("[WebSocket] Starting ESP32 frame processing loop...")
-        
+    async def _process_esp32_frames(self):
+        """Process frames from ESP32 stream on the event loop (non-blocking socket reads)."""
         try:
-            self.esp32_conn.settimeout(5.0)
-        except Exception as e:
-            print(f"[WebSocket] Error setting socket timeout: {e}")
-            return
+            if not self.esp32_conn:
+                return
+            
+            log.info("Starting ESP32 frame processing loop...")
+            if not CV2_AVAILABLE:
+                log.info("OpenCV/numpy not available, using raw payload")
+            
+            try:
+                self.esp32_conn.setblocking(False)
+            except Exception as e:
+                log.error("Error making ESP32 socket non-blocking: %s", e)
+                return
+            
+            await self._read_esp32_frames()
+        finally:
+            # The stream is over either way; close here so the socket isn't closed under a pending read
+            if self.esp32_conn:
+                try:
+                    self.esp32_conn.close()
+                except Exception:
+                    pass
+            self._esp32_frames_done.set()
+    
+    async def _read_esp32_frames(self):
+        """ESP32 frame reading loop (see _process_esp32_frames)."""
         
         # Error tracking for graceful handling
         consecutive_errors = 0
@@ -309,198 +751,183 @@ class WebSocketServer:
         frame_count = 0
         fps_start_time = time.time()
         fps_window_size = 30  # Calculate FPS over last 30 frames
-        frame_timestamps = []
+        frame_timestamps = deque(maxlen=fps_window_size)
+        
+        # Receive buffer reused for every frame (no per-frame allocation)
+        rx = _RecvBuffer(ESP32_RX_BUFFER_SIZE)
+        
+        # Loop-invariant bindings (saves attribute lookups per frame)
+        loop = asyncio.get_running_loop()
+        esp32_conn = self.esp32_conn
+        stop_flag = self.esp32_stop_flag
+        recognition_enabled = self.facial_recognition_service is not None
+        latest_frame_lock = self._latest_frame_lock
+        latest_frame_ready = self._latest_frame_ready
+        read_exact = rx.read_exact
         
         try:
-            while not self.esp32_stop_flag.is_set():
+            while not stop_flag.is_set():
                 frame_start_time = time.time()
                 try:
                     # Read frame header (8 bytes: 4-byte magic + 4-byte length)
                     try:
-                        header = _recv_exact(self.esp32_conn, 8)
+                        async with asyncio.timeout(ESP32_READ_TIMEOUT_SECONDS):
+                            header = await read_exact(loop, esp32_conn, 8)
                     except socket.error as e:
                         consecutive_errors += 1
                         if consecutive_errors >= max_consecutive_errors:
-                            print(f"[WebSocket] Socket error reading header (persistent): {e}")
+                            log.error("Socket error reading header (persistent): %s", e)
                             break
-                        print(f"[WebSocket] Socket error reading frame header: {e}, retrying...")
+                        log.error("Socket error reading frame header: %s, retrying...", e)
                         continue
                     except Exception as e:
                         consecutive_errors += 1
                         if consecutive_errors >= max_consecutive_errors:
-                            print(f"[WebSocket] Unexpected error reading header (persistent): {e}")
+                            log.error("Unexpected error reading header (persistent): %s", e)
                             break
-                        print(f"[WebSocket] Error reading frame header: {e}, retrying...")
+                        log.error("Error reading frame header: %s, retrying...", e)
                         continue
                     
                     if not header or len(header) < 8:
                         consecutive_errors += 1
                         if consecutive_errors >= max_consecutive_errors:
-                            print("[WebSocket] ESP32 stream closed by device (persistent)")
+                            log.error("ESP32 stream closed by device (persistent)")
                             break
-                        print(f"[WebSocket] Failed to read frame header (got {len(header) if header else 0} bytes), skipping...")
+                        log.warning("Failed to read frame header (got %s bytes), skipping...", len(header) if header else 0)
                         continue
                     
                     # Validate frame header magic
-                    if len(header) >= 4 and header[:4] != b"VXL0":
+                    if header[:4] != FRAME_MAGIC:
                         consecutive_errors += 1
                         if consecutive_errors >= max_consecutive_errors:
-                            print(f"[WebSocket] Invalid frame header (persistent): {header[:4]}, stopping")
+                            log.error("Invalid frame header (persistent): %s, stopping", bytes(header[:4]))
                             break
-                        print(f"[WebSocket] Invalid frame header: {header[:4]}, skipping frame...")
+                        log.warning("Invalid frame header: %s, skipping frame...", bytes(header[:4]))
                         continue
                     
-                    # Validate and extract frame length
-                    try:
-                        if len(header) < 8:
-                            consecutive_errors += 1
-                            if consecutive_errors >= max_consecutive_errors:
-                                print("[WebSocket] Incomplete header (persistent)")
-                                break
-                            print("[WebSocket] Incomplete header, skipping...")
-                            continue
-                        
-                        frame_len = struct.unpack(">I", header[4:8])[0]
-                    except struct.error as e:
-                        consecutive_errors += 1
-                        if consecutive_errors >= max_consecutive_errors:
-                            print(f"[WebSocket] Error unpacking frame length (persistent): {e}")
-                            break
-                        print(f"[WebSocket] Error unpacking frame length: {e}, skipping...")
-                        continue
+                    # Extract frame length (header is known to be complete here)
+                    frame_len = _FRAME_LENGTH.unpack_from(header, 4)[0]
                     
-                    if frame_len <= 0 or frame_len > 5 * 1024 * 1024:
+                    if frame_len <= 0 or frame_len > MAX_FRAME_SIZE:
                         consecutive_errors += 1
                         if consecutive_errors >= max_consecutive_errors:
-                            print(f"[WebSocket] Invalid frame length (persistent): {frame_len}")
+                            log.error("Invalid frame length (persistent): %s", frame_len)
                             break
-                        print(f"[WebSocket] Invalid frame length: {frame_len}, skipping...")
+                        if frame_len > MAX_DISCARD_SIZE:
+                            # Not a plausible frame: the stream is out of sync and can't be recovered
+                            log.error("Implausible frame length: %s, stopping", frame_len)
+                            break
+                        log.warning("Invalid frame length: %s, skipping...", frame_len)
+                        if frame_len > 0:
+                            # Discard the oversize payload through the receive buffer (no allocation)
+                            # so the next read lands on a frame header again
+                            async with asyncio.timeout(ESP32_READ_TIMEOUT_SECONDS):
+                                await rx.discard(loop, esp32_conn, frame_len)
                         continue
                     
                     # Read frame payload
                     try:
-                        payload = _recv_exact(self.esp32_conn, frame_len)
+                        async with asyncio.timeout(ESP32_READ_TIMEOUT_SECONDS):
+                            payload = await read_exact(loop, esp32_conn, frame_len)
                     except socket.error as e:
                         consecutive_errors += 1
                         if consecutive_errors >= max_consecutive_errors:
-                            print(f"[WebSocket] Socket error reading payload (persistent): {e}")
+                            log.error("Socket error reading payload (persistent): %s", e)
                             break
-                        print(f"[WebSocket] Socket error reading frame payload: {e}, skipping...")
+                        log.error("Socket error reading frame payload: %s, skipping...", e)
                         continue
                     except Exception as e:
                         consecutive_errors += 1
                         if consecutive_errors >= max_consecutive_errors:
-                            print(f"[WebSocket] Error reading frame payload (persistent): {e}")
+                            log.error("Error reading frame payload (persistent): %s", e)
                             break
-                        print(f"[WebSocket] Error reading frame payload: {e}, skipping...")
+                        log.error("Error reading frame payload: %s, skipping...", e)
                         continue
                     
                     if not payload or len(payload) != frame_len:
                         consecutive_errors += 1
                         if consecutive_errors >= max_consecutive_errors:
-                            print(f"[WebSocket] Failed to read frame payload (persistent): got {len(payload) if payload else 0} bytes, expected {frame_len}")
+                            log.error("Failed to read frame payload (persistent): got %s bytes, expected %s", len(payload) if payload else 0, frame_len)
                             break
-                        print(f"[WebSocket] Failed to read frame payload: got {len(payload) if payload else 0} bytes, expected {frame_len}, skipping frame...")
+                        log.warning("Failed to read frame payload: got %s bytes, expected %s, skipping frame...", len(payload) if payload else 0, frame_len)
                         continue
                     
                     # Reset error counter on successful frame read
                     consecutive_errors = 0
                 
-                    # Decode frame
-                    try:
-                        import cv2
-                        import numpy as np
-                    except ImportError as e:
-                        print(f"[WebSocket] OpenCV/numpy not available: {e}, using raw payload")
+                    # JPEG frames (the device's normal output) are forwarded as-is; recognition decodes
+                    # them itself. Anything else is decoded and re-encoded as JPEG.
+                    if payload[:2] == JPEG_SOI or not CV2_AVAILABLE:
                         frame_data = payload
                     else:
                         try:
-                            frame_array = np.frombuffer(payload, dtype=np.uint8)
-                            if len(frame_array) == 0:
+                            # CPU-bound, so keep it off the event loop
+                            frame_data = await loop.run_in_executor(None, _reencode_as_jpeg, payload)
+                            if frame_data is None:
                                 continue
-                            image = cv2.imdecode(frame_array, cv2.IMREAD_COLOR)
-                            if image is None:
-                                continue
-                            # Re-encode as JPEG for processing
-                            success, encoded = cv2.imencode('.jpg', image)
-                            if not success or encoded is None:
-                                continue
-                            frame_data = encoded.tobytes()
                         except ValueError as e:
-                            print(f"[WebSocket] ValueError decoding frame: {e}, skipping frame...")
+                            log.error("ValueError decoding frame: %s, skipping frame...", e)
                             continue
                         except Exception as e:
-                            print(f"[WebSocket] Error decoding frame: {e}, skipping frame...")
-                            import traceback
-                            traceback.print_exc()
+                            log.exception("Error decoding frame: %s, skipping frame...", e)
                             continue
                     
                     # Increment frame count before checking
                     frame_count += 1
                     
-                    # Queue frame for non-blocking face recognition processing
+                    # Hand frame to the face recognition worker (non-blocking)
                     # Only process every 10th frame (when frame_count % 10 == 1) to reduce load
                     queue_dropped = False
-                    if self.facial_recognition_service and self.face_recognition_queue:
-                        if frame_count % 10 == 1:
-                            try:
-                                # Put frame in queue (non-blocking, drop if queue is full to prevent memory buildup)
-                                self.face_recognition_queue.put_nowait(frame_data)
-                            except queue.Full:
-                                # Queue is full, skip this frame to maintain FPS
+                    if recognition_enabled and frame_count % 10 == 1:
+                        # Copied here since the receive buffer is reused for the next frame
+                        latest_frame = bytes(frame_data)
+                        with latest_frame_lock:
+                            # Worker hasn't picked up the previous frame yet: replace it with this newer one
+                            if self._latest_frame is not None:
                                 queue_dropped = True
-                            except Exception as e:
-                                print(f"[WebSocket] Error queuing frame for recognition: {e}")
+                                self._dropped_frames += 1
+                            self._latest_frame = latest_frame
+                            latest_frame_ready.set()
                     
-                    # Calculate FPS and log summary
+                    # Record frame time; FPS is only computed for the throttled summary line
                     frame_end_time = time.time()
                     frame_timestamps.append(frame_end_time)
-                    if len(frame_timestamps) > fps_window_size:
-                        frame_timestamps.pop(0)
                     
-                    if len(frame_timestamps) >= 2:
+                    # Throttled summary line (one every LOG_EVERY_N_FRAMES frames)
+                    if frame_count % LOG_EVERY_N_FRAMES == 0:
                         time_span = frame_timestamps[-1] - frame_timestamps[0]
-                        if time_span > 0:
-                            current_fps = (len(frame_timestamps) - 1) / time_span
-                        else:
-                            current_fps = 0
-                    else:
-                        current_fps = 0
-                    
-                    total_time = frame_end_time - frame_start_time
-                    queue_depth = self.face_recognition_queue.qsize() if self.face_recognition_queue else 0
-                    dropped_str = " [DROPPED]" if queue_dropped else ""
-                    #print(f"[Frame #{frame_count}] {total_time*1000:.1f}ms | FPS: {current_fps:.1f} | Queue: {queue_depth}{dropped_str}")
+                        current_fps = (len(frame_timestamps) - 1) / time_span if time_span > 0 else 0
+                        total_time = frame_end_time - frame_start_time
+                        queue_depth = 0 if self._latest_frame is None else 1
+                        dropped_str = " [DROPPED]" if queue_dropped else ""
+                        log.info("Frame #%d %.1fms | FPS: %.1f | Queue: %d%s", frame_count, total_time * 1000, current_fps, queue_depth, dropped_str)
                 
                 except socket.timeout:
                     consecutive_errors += 1
                     if consecutive_errors >= max_consecutive_errors:
-                        print("[WebSocket] ESP32 connection timeout (persistent)")
+                        log.error("ESP32 connection timeout (persistent)")
                         break
-                    print("[WebSocket] ESP32 connection timeout, retrying...")
+                    log.warning("ESP32 connection timeout, retrying...")
                     continue
                 except Exception as e:
                     consecutive_errors += 1
                     if consecutive_errors >= max_consecutive_errors:
-                        print(f"[WebSocket] Error in ESP32 frame processing (persistent): {e}")
-                        import traceback
-                        traceback.print_exc()
+                        log.exception("Error in ESP32 frame processing (persistent): %s", e)
                         break
-                    print(f"[WebSocket] Error in ESP32 frame processing: {e}, retrying...")
+                    log.error("Error in ESP32 frame processing: %s, retrying...", e)
                     continue
                 
         except Exception as e:
-            print(f"[WebSocket] Fatal error in ESP32 frame processing: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Fatal error in ESP32 frame processing: %s", e)
         finally:
-            print("[WebSocket] ESP32 frame processing loop stopped")
+            log.info("ESP32 frame processing loop stopped")
     
     def _notify_all_clients_person_switch(self, person_id: Optional[str], person_name: Optional[str], recap: Optional[str]):
         """Notify all connected WebSocket clients about person switch.
         
-        This method can be called from a background thread. It uses a queue to pass
-        the notification to the main event loop.
+        This method can be called from a background thread. The message is serialized
+        here, once, and handed to the main event loop, which broadcasts the latest
+        pending switch.
         
         Args:
             person_id: Person ID (None for no person)
@@ -508,34 +935,42 @@ class WebSocketServer:
             recap: Recap text
         """
         if person_id:
-            print(f"[WebSocket] 🔄 Person switch notification: {person_name} ({person_id})")
+            log.info("🔄 Person switch notification: %s (%s)", person_name, person_id)
         else:
-            print(f"[WebSocket] 🔄 Person switch notification: No person")
+            log.info("🔄 Person switch notification: No person")
         
-        # Use queue to pass message to main event loop (thread-safe)
-        if self.person_switch_queue and self.main_event_loop:
+        # Hand off to the main event loop (thread-safe)
+        if self._person_switch_ready and self.main_event_loop:
             try:
-                # Put notification in queue (non-blocking, thread-safe)
+                display_name, message = _person_switch_message(person_id, person_name, recap)
                 self.main_event_loop.call_soon_threadsafe(
-                    self.person_switch_queue.put_nowait,
-                    (person_id, person_name, recap)
+                    self._set_pending_person_switch,
+                    (person_id, display_name, message)
                 )
             except Exception as e:
-                print(f"[WebSocket] Error queuing person switch notification: {e}")
+                log.error("Error queuing person switch notification: %s", e)
         else:
-            print(f"[WebSocket] Warning: Person switch queue not initialized, notification dropped")
+            log.warning("Person switch queue not initialized, notification dropped")
     
     def _process_face_recognition_worker(self):
-        """Worker thread that processes frames from the queue for face recognition."""
-        print("[FaceRecognitionWorker] Face recognition worker thread started")
+        """Worker thread that runs face recognition on the latest handed-off frame."""
+        worker_log.info("Face recognition worker thread started")
+        # Out of process this thread only waits on the pipe; the worker process is pinned and
+        # prioritized itself
+        if self._cpu_affinity and not isinstance(self.facial_recognition_service, FacialRecognitionProcess):
+            _set_thread_affinity(self._cpu_affinity[2])
+            _set_thread_nice(RECOGNITION_WORKER_NICE)
         frame_process_count = 0
         
         while not self.esp32_stop_flag.is_set():
             try:
-                # Get frame from queue with timeout to allow checking stop flag
-                try:
-                    frame_data = self.face_recognition_queue.get(timeout=0.1)
-                except queue.Empty:
+                # Block until a frame is handed off; stop_esp32_processing also sets the event to wake us
+                self._latest_frame_ready.wait()
+                with self._latest_frame_lock:
+                    frame_data = self._latest_frame
+                    self._latest_frame = None
+                    self._latest_frame_ready.clear()
+                if frame_data is None:
                     continue
                 
                 # Process frame through facial recognition service
@@ -552,61 +987,82 @@ class WebSocketServer:
                         # If person switch detected, notify all WebSocket clients and update orchestrator state
                         if switch_detected:
                             person_name = None
+                            recap = None
                             
                             if person_id is not None and self.facial_recognition_service.database_manager:
-                                # Switch to a person - get name (fast path: check cache first)
+                                # Switch to a person - get name/recap (fast path: check cache first)
                                 try:
-                                    # Get person name (with caching to avoid repeated DB queries)
-                                    # Check cache first (fast, no blocking)
-                                    if person_id in self.facial_recognition_service._person_name_cache:
-                                        person_name = self.facial_recognition_service._person_name_cache[person_id]
+                                    with self._person_cache_lock:
+                                        cached = self._person_cache.get(person_id)
+                                    if cached and time.monotonic() < cached[2]:
+                                        person_name, recap, _ = cached
                                     else:
-                                        # Cache miss - query database (blocking, but fast)
+                                        # Cache miss or expired - query database (blocking, but fast)
                                         person_name = self.facial_recognition_service.database_manager.get_person_name(person_id)
-                                        if person_name:
-                                            # Cache the result
-                                            self.facial_recognition_service._person_name_cache[person_id] = person_name
-                                    if not person_name:
-                                        person_name = person_id
+                                        if not person_name:
+                                            person_name = person_id
+                                        with self._person_cache_lock:
+                                            self._person_cache[person_id] = (person_name, None, time.monotonic() + PERSON_CACHE_TTL_SECONDS)
                                     
-                                    # Generate recap from all summaries in background thread (non-blocking)
-                                    # This prevents blocking the worker thread for up to 30 seconds
-                                    if not self.summarizer:
-                                        self.summarizer = ConversationSummarizer(
-                                            database_manager=self.facial_recognition_service.database_manager
-                                        )
+                                    # Check and claim in one step so a concurrent switch can't start a second LLM call
+                                    with self._person_cache_lock:
+                                        start_recap = recap is None and person_id not in self._recaps_in_flight
+                                        if start_recap:
+                                            self._recaps_in_flight.add(person_id)
+                                            summary_generation = self._summary_generations.get(person_id, 0)
                                     
-                                    # Generate recap in background thread to avoid blocking
-                                    def _generate_recap_async(target_person_id: str, target_person_name: str):
-                                        """Generate recap in background thread (non-blocking)."""
+                                    if start_recap:
+                                        # Generate recap from all summaries in background thread (non-blocking)
+                                        # This prevents blocking the worker thread for up to 30 seconds
+                                        def _generate_recap_async(target_person_id: str, target_person_name: str, summary_generation: int):
+                                            """Generate recap in background thread (non-blocking)."""
+                                            try:
+                                                generated_recap = self.summarizer.generate_recap_from_summaries(target_person_id)
+                                                worker_log.info("[Background] Recap generated for %s (%s)", target_person_name, target_person_id)
+                                                # Cache the recap so the next switch to this person can send it right away,
+                                                # unless a summary was saved meanwhile (the recap would leave it out)
+                                                with self._person_cache_lock:
+                                                    entry = self._person_cache.get(target_person_id)
+                                                    current_generation = self._summary_generations.get(target_person_id, 0)
+                                                    if generated_recap and entry and current_generation == summary_generation:
+                                                        self._person_cache[target_person_id] = (entry[0], generated_recap, entry[2])
+                                            except Exception as e:
+                                                worker_log.error("[Background] Error generating recap for %s: %s", target_person_id, e)
+                                            finally:
+                                                with self._person_cache_lock:
+                                                    self._recaps_in_flight.discard(target_person_id)
+                                        
+                                        # Start background thread for recap generation (non-blocking). A flicker back
+                                        # to this person while it runs reuses it instead of starting another LLM call.
                                         try:
-                                            generated_recap = self.summarizer.generate_recap_from_summaries(target_person_id)
-                                            print(f"[FaceRecognitionWorker] [Background] Recap generated for {target_person_name} ({target_person_id})")
-                                            # Note: Recap is generated but not sent to clients to avoid blocking
-                                            # Future enhancement: Could send follow-up notification with recap
-                                        except Exception as e:
-                                            print(f"[FaceRecognitionWorker] [Background] Error generating recap for {target_person_id}: {e}")
-                                    
-                                    # Start background thread for recap generation (non-blocking)
-                                    recap_thread = threading.Thread(
-                                        target=_generate_recap_async,
-                                        args=(person_id, person_name),
-                                        daemon=True
-                                    )
-                                    recap_thread.start()
-                                    # Continue without waiting - send notification immediately with recap=None
+                                            if not self.summarizer:
+                                                self.summarizer = ConversationSummarizer(
+                                                    database_manager=self.facial_recognition_service.database_manager
+                                                )
+                                            recap_thread = threading.Thread(
+                                                target=_generate_recap_async,
+                                                args=(person_id, person_name, summary_generation),
+                                                daemon=True
+                                            )
+                                            recap_thread.start()
+                                        except Exception:
+                                            # Release the claim so a later switch can try again
+                                            with self._person_cache_lock:
+                                                self._recaps_in_flight.discard(person_id)
+                                            raise
+                                        # Continue without waiting - send notification immediately with recap=None
                                 except Exception as e:
-                                    print(f"[FaceRecognitionWorker] Error getting person info: {e}")
+                                    worker_log.error("Error getting person info: %s", e)
                             # else: person_id is None, so switch to no person
                             
                             # Update orchestrator conversation state for all active connections
-                            print(f"[FaceRecognitionWorker] 🔄 Person switch detected: updating {len(self.connections)} orchestrator(s)")
-                            for connection_id, conn_info in list(self.connections.items()):
+                            worker_log.info("🔄 Person switch detected: updating %s orchestrator(s)", len(self._connections_snapshot))
+                            for connection_id, conn_info in self._connections_snapshot:
                                 orchestrator = conn_info.get("orchestrator")
                                 if orchestrator:
                                     try:
                                         previous_person = orchestrator.conversation_state.current_person_id
-                                        print(f"[FaceRecognitionWorker] Orchestrator {connection_id}: previous_person={previous_person}, new_person={person_id}")
+                                        worker_log.info("Orchestrator %s: previous_person=%s, new_person=%s", connection_id, previous_person, person_id)
                                         
                                         # Update conversation state
                                         orchestrator.conversation_state.current_person_id = person_id
@@ -615,73 +1071,120 @@ class WebSocketServer:
                                         # Call orchestrator's person switch handler if person_id changed
                                         # This will generate summary for previous person and clear chat history
                                         if hasattr(orchestrator, '_handle_person_switch'):
-                                            print(f"[FaceRecognitionWorker] Calling _handle_person_switch for {connection_id}")
+                                            worker_log.info("Calling _handle_person_switch for %s", connection_id)
                                             orchestrator._handle_person_switch(person_id)
                                         else:
-                                            print(f"[FaceRecognitionWorker] ⚠️ Orchestrator {connection_id} missing _handle_person_switch method")
+                                            worker_log.warning("⚠️ Orchestrator %s missing _handle_person_switch method", connection_id)
                                     except Exception as e:
-                                        print(f"[FaceRecognitionWorker] ❌ Error updating orchestrator {connection_id} state: {e}")
-                                        import traceback
-                                        traceback.print_exc()
+                                        worker_log.exception("❌ Error updating orchestrator %s state: %s", connection_id, e)
                                 else:
-                                    print(f"[FaceRecognitionWorker] ⚠️ No orchestrator found for connection {connection_id}")
+                                    worker_log.warning("⚠️ No orchestrator found for connection %s", connection_id)
                             
                             # Send person switch notification immediately (non-blocking) without waiting for recap
-                            # Recap will be None initially, generated in background
-                            self._notify_all_clients_person_switch(person_id, person_name, None)
+                            # Recap is only included when already cached, otherwise it is generated in background
+                            self._notify_all_clients_person_switch(person_id, person_name, recap)
                     except Exception as e:
-                        print(f"[FaceRecognitionWorker] Error processing frame: {e}")
-                        import traceback
-                        traceback.print_exc()
+                        worker_log.exception("Error processing frame: %s", e)
                         # Continue processing - don't break on recognition errors
                 
-                frame_process_end_time = time.time()
-                total_frame_time = (frame_process_end_time - frame_process_start_time) * 1000
-                switch_str = f" | SWITCH: {person_name or person_id or 'None'}" if switch_detected else ""
-                print(f"[Recognition #{frame_process_count}] {total_frame_time:.1f}ms | person_id={person_id}{switch_str}")
-                
-                # Mark task as done
-                self.face_recognition_queue.task_done()
+                # Log switches, plus a throttled line for routine recognitions
+                if switch_detected or frame_process_count % LOG_EVERY_N_RECOGNITIONS == 0:
+                    total_frame_time = (time.time() - frame_process_start_time) * 1000
+                    switch_str = f" | SWITCH: {person_name or person_id or 'None'}" if switch_detected else ""
+                    worker_log.info("Recognition #%d %.1fms | person_id=%s%s | dropped=%d", frame_process_count, total_frame_time, person_id, switch_str, self._dropped_frames)
                 
             except Exception as e:
-                print(f"[FaceRecognitionWorker] Error in worker: {e}")
-                import traceback
-                traceback.print_exc()
+                worker_log.exception("Error in worker: %s", e)
                 continue
         
-        print(f"[FaceRecognitionWorker] Worker thread stopped (processed {frame_process_count} frames)")
+        worker_log.info("Worker thread stopped (processed %s frames)", frame_process_count)
+    
+    def _on_summary_saved(self, person_id: str) -> None:
+        """Drop the cached recap for a person after an orchestrator saves a new summary for them.
+        
+        Called from orchestrator background threads. The cached name stays valid; recaps still being
+        generated from the older summaries are discarded when they finish.
+        
+        Args:
+            person_id: Person the summary was saved for
+        """
+        # Same lock as the recap threads' compare-and-store, so a recap can't land after this
+        with self._person_cache_lock:
+            self._summary_generations[person_id] = self._summary_generations.get(person_id, 0) + 1
+            entry = self._person_cache.get(person_id)
+            if entry and entry[1] is not None:
+                self._person_cache[person_id] = (entry[0], None, entry[2])
+    
+    def _invalidate_person_cache(self, person_id: Optional[str] = None) -> None:
+        """Invalidate cached person name/recap lookups.
+        
+        Args:
+            person_id: Specific person ID to invalidate, or None to clear all
+        """
+        with self._person_cache_lock:
+            if person_id:
+                self._person_cache.pop(person_id, None)
+            else:
+                self._person_cache.clear()
+        
+        if self.facial_recognition_service:
+            self.facial_recognition_service.invalidate_person_name_cache(person_id)
     
     def start_esp32_processing(self):
-        """Start ESP32 frame processing in background thread."""
-        if self.esp32_conn and self.facial_recognition_service:
+        """Start ESP32 frame processing (reader task on the event loop, recognition in a worker thread).
+        
+        Safe to call from any thread.
+        """
+        if self.esp32_conn and self.facial_recognition_service and self.main_event_loop:
             self.esp32_stop_flag.clear()
             
-            # Create queue for face recognition processing (max 2 frames to prevent memory buildup)
-            self.face_recognition_queue = queue.Queue(maxsize=2)
+            # Start with an empty frame slot
+            with self._latest_frame_lock:
+                self._latest_frame = None
+                self._latest_frame_ready.clear()
+                self._dropped_frames = 0
+            
+            # Start frame reading task on the event loop
+            self._esp32_frames_done.clear()
+            self.main_event_loop.call_soon_threadsafe(self._start_esp32_frames_task)
+            log.info("ESP32 frame processing task scheduled")
             
-            # Start frame reading thread
-            self.esp32_stream_thread = threading.Thread(target=self._process_esp32_frames, daemon=True)
-            self.esp32_stream_thread.start()
-            print("[WebSocket] ESP32 frame processing thread started")
+            # An out-of-process service warms its models up before reporting ready
+            if not isinstance(self.facial_recognition_service, FacialRecognitionProcess):
+                self.facial_recognition_service.warmup()
             
             # Start face recognition worker thread
             self.face_recognition_thread = threading.Thread(target=self._process_face_recognition_worker, daemon=True)
             self.face_recognition_thread.start()
-            print("[WebSocket] Face recognition worker thread started")
+            log.info("Face recognition worker thread started")
+    
+    def _start_esp32_frames_task(self) -> None:
+        """Create the ESP32 frame reader task (must run on the loop thread)."""
+        self._esp32_frames_task = asyncio.create_task(self._process_esp32_frames())
+    
+    def _cancel_esp32_frames_task(self) -> None:
+        """Cancel the ESP32 frame reader task (must run on the loop thread)."""
+        if self._esp32_frames_task:
+            self._esp32_frames_task.cancel()
     
     def stop_esp32_processing(self):
         """Stop ESP32 frame processing."""
         self.esp32_stop_flag.set()
+        # Wake the recognition worker (it waits on the frame event without a timeout) so it sees the stop flag
+        self._latest_frame_ready.set()
         
         # Wait for face recognition worker thread
         if self.face_recognition_thread:
             self.face_recognition_thread.join(timeout=2.0)
         
-        # Wait for frame reading thread
-        if self.esp32_stream_thread:
-            self.esp32_stream_thread.join(timeout=2.0)
+        # Stop the frame reading task; wait for it unless we're on the loop thread it runs on
+        if self.main_event_loop and not self._esp32_frames_done.is_set():
+            self.main_event_loop.call_soon_threadsafe(self._cancel_esp32_frames_task)
+            if not _on_loop_thread(self.main_event_loop):
+                self._esp32_frames_done.wait(timeout=2.0)
         
-        if self.esp32_conn:
+        # The reader task closes the socket itself if it's still unwinding
+        if self.esp32_conn and self._esp32_frames_done.is_set():
             try:
                 self.esp32_conn.close()
             except Exception:
@@ -694,120 +1197,79 @@ class WebSocketServer:
             except Exception:
                 pass
         
-        # Clear queue
-        if self.face_recognition_queue:
+        # Stop the recognition worker process (if recognition runs out of process)
+        if isinstance(self.facial_recognition_service, FacialRecognitionProcess):
             try:
-                while True:
-                    self.face_recognition_queue.get_nowait()
-            except queue.Empty:
-                pass
+                self.facial_recognition_service.close()
+            except Exception as e:
+                log.error("Error stopping facial recognition process: %s", e)
         
-        print("[WebSocket] ESP32 processing stopped")
+        # Drop any frame still waiting for recognition
+        with self._latest_frame_lock:
+            self._latest_frame = None
+            self._latest_frame_ready.clear()
         
-    async def handle_connection(self, websocket: WebSocketServerProtocol, path: str = ""):
+        log.info("ESP32 processing stopped")
+        
+    async def handle_connection(self, websocket: ServerConnection):
         """Handle a new WebSocket connection.
         
         Args:
             websocket: WebSocket connection
-            path: Connection path (optional, for compatibility with websockets library)
         """
-        # Get remote address safely - may not be available during handshake
-        try:
-            remote_addr = getattr(websocket, 'remote_address', None)
-            if remote_addr:
-                connection_id = f"{remote_addr[0]}:{remote_addr[1]}"
-            else:
-                connection_id = "unknown"
-        except Exception:
-            connection_id = "unknown"
+        # Key by object identity (unique while the connection is registered); the
+        # printable "ip:port" label is only for log lines
+        connection_id = id(websocket)
+        connection_label = _describe_connection(websocket)
+        
+        log.info("New connection: %s (path: %s)", connection_label, websocket.request.path)
         
-        print(f"[WebSocket] New connection: {connection_id} (path: {path})")
+        writer_task: Optional[asyncio.Task] = None
         
         # Initialize orchestrator for this connection
-        background_tasks = []  # Store tasks for cleanup
         try:
-            database_manager = None
-            try:
-                database_manager = DatabaseManager()
-            except Exception as e:
-                print(f"[WebSocket] Warning: Database not available: {e}")
-            
-            orchestrator = ConversationOrchestrator(database_manager=database_manager)
+            orchestrator = ConversationOrchestrator(database_manager=self._get_database_manager())
             
             # Set up callbacks
             # Store websocket in closure for callbacks
             ws_ref = websocket
             
-            # Create a queue to pass messages from sync context to async context
-            notification_queue = asyncio.Queue()
-            person_switch_queue = asyncio.Queue()
-            
-            async def _send_notification_async(title: str, message: str):
-                """Async helper to send notification."""
-                try:
-                    await self._send_notification(ws_ref, title, message)
-                except Exception as e:
-                    print(f"[WebSocket] Error sending notification: {e}")
-            
-            async def _send_person_switch_async(person_id: Optional[str], person_name: Optional[str], recap: Optional[str] = None):
-                """Async helper to send person switch."""
-                try:
-                    await self._send_person_switch(ws_ref, person_id, person_name, recap)
-                except Exception as e:
-                    print(f"[WebSocket] Error sending person switch: {e}")
+            # Outbound sends for this connection go through one bounded queue drained by a
+            # long-lived writer task (ordered, no task per send, bounded memory per slow client)
+            outbound: asyncio.Queue = asyncio.Queue(maxsize=OUTBOUND_QUEUE_SIZE)
+            writer_task = asyncio.create_task(self._connection_writer(ws_ref, outbound))
             
-            # Background task to process queued notifications
-            async def process_notification_queue():
-                while True:
-                    try:
-                        title, message = await notification_queue.get()
-                        await _send_notification_async(title, message)
-                        notification_queue.task_done()
-                    except asyncio.CancelledError:
-                        break
-                    except Exception as e:
-                        print(f"[WebSocket] Error processing notification queue: {e}")
-            
-            # Background task to process queued person switches
-            async def process_person_switch_queue():
-                while True:
-                    try:
-                        person_id, person_name, recap = await person_switch_queue.get()
-                        await _send_person_switch_async(person_id, person_name, recap)
-                        person_switch_queue.task_done()
-                    except asyncio.CancelledError:
-                        break
-                    except Exception as e:
-                        print(f"[WebSocket] Error processing person switch queue: {e}")
-            
-            # Start background tasks
-            notification_task = asyncio.create_task(process_notification_queue())
-            person_switch_task = asyncio.create_task(process_person_switch_queue())
-            
-            # Store tasks for cleanup
-            background_tasks.extend([notification_task, person_switch_task])
-            
-            # Wrap async callbacks to be called from sync context (tool execution)
+            # Wrap async sends to be called from sync context (tool execution / worker threads).
+            # Callbacks may fire off the event loop thread, so hand the send straight to the loop.
             def on_notification_sync(title: str, message: str):
                 """Callback when notification tool is called (from sync context)."""
                 try:
-                    # Put notification in queue (non-blocking)
-                    notification_queue.put_nowait((title, message))
+                    self.main_event_loop.call_soon_threadsafe(
+                        self._enqueue_send,
+                        outbound,
+                        self._send_notification,
+                        (title, message)
+                    )
                 except Exception as e:
-                    print(f"[WebSocket] Error queuing notification: {e}")
+                    log.error("Error scheduling notification: %s", e)
             
             def on_person_switch_sync(person_id: Optional[str], person_name: Optional[str], recap: Optional[str] = None):
                 """Callback when person switches (from sync context)."""
                 try:
-                    # Put person switch in queue (non-blocking)
-                    person_switch_queue.put_nowait((person_id, person_name, recap))
+                    self.main_event_loop.call_soon_threadsafe(
+                        self._enqueue_send,
+                        outbound,
+                        self._send_person_switch,
+                        (person_id, person_name, recap)
+                    )
                 except Exception as e:
-                    print(f"[WebSocket] Error queuing person switch: {e}")
+                    log.error("Error scheduling person switch: %s", e)
             
             # Set orchestrator callbacks (this also sets the notification tool callback)
             orchestrator.set_callbacks(
                 on_notification=on_notification_sync,
-                on_person_switch=on_person_switch_sync
+                on_person_switch=on_person_switch_sync,
+                on_summary_saved=self._on_summary_saved
             )
             
             # Initialize speech handler for audio processing
@@ -819,17 +1281,17 @@ class WebSocketServer:
                 )
                 orchestrator.start()
             except Exception as e:
-                print(f"[WebSocket] Warning: Failed to initialize speech handler: {e}")
-                print("[WebSocket] Continuing without speech handler - audio processing disabled")
+                log.warning("Failed to initialize speech handler: %s", e)
+                log.info("Continuing without speech handler - audio processing disabled")
             
             # Store connection info
-            self.connections[connection_id] = {
+            self._add_connection(connection_id, {
                 "websocket": websocket,
                 "orchestrator": orchestrator
-            }
+            })
             
             # Send welcome message
-            await websocket.send(json.dumps({
+            await websocket.send(_dumps({
                 "type": "connected",
                 "message": "WebSocket connection established"
             }))
@@ -843,42 +1305,87 @@ class WebSocketServer:
                     elif isinstance(message, str):
                         # Text message = control message
                         try:
-                            data = json.loads(message)
+                            data = _loads(message)
                             await self._handle_control_message(websocket, orchestrator, data)
                         except json.JSONDecodeError:
-                            print(f"[WebSocket] Invalid JSON: {message}")
+                            log.warning("Invalid JSON: %s", message)
             
             except websockets.exceptions.ConnectionClosed:
-                print(f"[WebSocket] Connection closed normally: {connection_id}")
+                log.info("Connection closed normally: %s", connection_label)
             except websockets.exceptions.InvalidMessage as e:
-                print(f"[WebSocket] Invalid message (connection may have closed during handshake): {e}")
+                log.warning("Invalid message (connection may have closed during handshake): %s", e)
             except Exception as e:
-                print(f"[WebSocket] Error handling connection: {e}")
-                import traceback
-                traceback.print_exc()
+                log.exception("Error handling connection: %s", e)
             finally:
                 # Cleanup
-                # Cancel background tasks
-                try:
-                    for task in background_tasks:
-                        task.cancel()
-                    # Wait for tasks to finish cancelling
-                    if background_tasks:
-                        await asyncio.gather(*background_tasks, return_exceptions=True)
-                except Exception as e:
-                    print(f"[WebSocket] Error cancelling background tasks: {e}")
-                
+                writer_task.cancel()
                 orchestrator.stop()
-                if connection_id in self.connections:
-                    del self.connections[connection_id]
-                print(f"[WebSocket] Connection cleaned up: {connection_id}")
+                self._remove_connection(connection_id)
+                # Wait for the writer to unwind so an error from an interrupted send is retrieved here
+                await asyncio.gather(writer_task, return_exceptions=True)
+                log.info("Connection cleaned up: %s", connection_label)
         
         except Exception as e:
-            print(f"[WebSocket] Error initializing orchestrator: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Error initializing orchestrator: %s", e)
+            if writer_task:
+                writer_task.cancel()
+                await asyncio.gather(writer_task, return_exceptions=True)
             await websocket.close()
     
+    def _add_connection(self, connection_id: int, conn_info: Dict) -> None:
+        """Register a connection and rebuild the connections snapshot.
+        
+        Args:
+            connection_id: Connection identifier
+            conn_info: Connection info ({websocket, orchestrator})
+        """
+        self.connections[connection_id] = conn_info
+        self._rebuild_connections_snapshot()
+    
+    def _remove_connection(self, connection_id: int) -> None:
+        """Unregister a connection and rebuild the connections snapshot.
+        
+        Args:
+            connection_id: Connection identifier
+        """
+        if self.connections.pop(connection_id, None) is not None:
+            self._rebuild_connections_snapshot()
+    
+    def _rebuild_connections_snapshot(self) -> None:
+        """Rebuild the immutable connection snapshots after a connect/disconnect."""
+        self._connections_snapshot = tuple(self.connections.items())
+        self._websockets_snapshot = tuple(
+            conn_info["websocket"]
+            for conn_info in self.connections.values()
+            if conn_info.get("websocket")
+        )
+    
+    def _enqueue_send(self, outbound: asyncio.Queue, send: Callable, args: Tuple) -> None:
+        """Queue a send for a connection's writer task (must run on the loop thread).
+        
+        Args:
+            outbound: Connection's outbound queue
+            send: Send coroutine function (e.g. _send_notification or _send_person_switch)
+            args: Arguments for send after the websocket
+        """
+        if outbound.full():
+            # Slow client: drop the oldest queued send so the newest (most relevant) one goes out
+            dropped_send, _ = outbound.get_nowait()
+            log.warning("Outbound queue full, dropping oldest %s", dropped_send.__name__)
+        outbound.put_nowait((send, args))
+    
+    async def _connection_writer(self, websocket: ServerConnection, outbound: asyncio.Queue):
+        """Send queued messages to one connection, in order, until cancelled.
+        
+        Args:
+            websocket: WebSocket connection
+            outbound: Connection's outbound queue of (send, args)
+        """
+        while True:
+            send, args = await outbound.get()
+            # Send helpers handle and log their own errors
+            await send(websocket, *args)
+    
     async def _handle_audio_chunk(self, orchestrator: ConversationOrchestrator, audio_data: bytes):
         """Handle incoming audio chunk.
         
@@ -887,23 +1394,21 @@ class WebSocketServer:
             audio_data: Raw audio bytes
         """
         if not orchestrator:
-            print("[WebSocket] Warning: No orchestrator available for audio chunk")
+            log.warning("No orchestrator available for audio chunk")
             return
         
         if not audio_data or len(audio_data) == 0:
-            print("[WebSocket] Warning: Empty audio chunk received")
+            log.warning("Empty audio chunk received")
             return
         
         try:
             orchestrator.process_audio_chunk(audio_data)
         except AttributeError as e:
-            print(f"[WebSocket] Error: Orchestrator missing required method: {e}")
+            log.error("Orchestrator missing required method: %s", e)
         except Exception as e:
-            print(f"[WebSocket] Error processing audio chunk: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Error processing audio chunk: %s", e)
     
-    async def _handle_control_message(self, websocket: WebSocketServerProtocol, orchestrator: ConversationOrchestrator, data: dict):
+    async def _handle_control_message(self, websocket: ServerConnection, orchestrator: ConversationOrchestrator, data: dict):
         """Handle control messages from client.
         
         Args:
@@ -912,127 +1417,124 @@ class WebSocketServer:
             data: Parsed JSON data
         """
         if not data or not isinstance(data, dict):
-            print("[WebSocket] Invalid control message: not a dictionary")
+            log.warning("Invalid control message: not a dictionary")
             try:
-                await websocket.send(json.dumps({
-                    "type": "error",
-                    "message": "Invalid message format"
-                }))
+                await websocket.send(INVALID_FORMAT_MESSAGE)
             except Exception as e:
-                print(f"[WebSocket] Error sending error response: {e}")
+                log.error("Error sending error response: %s", e)
             return
         
         msg_type = data.get("type")
         
         if not msg_type:
-            print("[WebSocket] Control message missing 'type' field")
+            log.warning("Control message missing 'type' field")
             try:
-                await websocket.send(json.dumps({
-                    "type": "error",
-                    "message": "Missing 'type' field"
-                }))
+                await websocket.send(MISSING_TYPE_MESSAGE)
             except Exception as e:
-                print(f"[WebSocket] Error sending error response: {e}")
+                log.error("Error sending error response: %s", e)
             return
         
         try:
-            if msg_type == "ping":
-                try:
-                    await websocket.send(json.dumps({"type": "pong"}))
-                except Exception as e:
-                    print(f"[WebSocket] Error sending pong: {e}")
-            elif msg_type == "set_interaction_id":
-                try:
-                    interaction_id = data.get("interaction_id")
-                    if not interaction_id:
-                        print("[WebSocket] Warning: set_interaction_id called with empty ID")
-                    if orchestrator and hasattr(orchestrator, 'conversation_state'):
-                        orchestrator.conversation_state.conversation_id = interaction_id
-                        print(f"[WebSocket] Interaction ID set to: {interaction_id}")
-                    else:
-                        print("[WebSocket] Warning: Orchestrator or conversation_state not available")
-                except AttributeError as e:
-                    print(f"[WebSocket] Error: Orchestrator missing conversation_state: {e}")
-                except Exception as e:
-                    print(f"[WebSocket] Error setting interaction ID: {e}")
-            elif msg_type == "change_name":
-                try:
-                    person_name = data.get("person_name")
-                    new_name = data.get("new_name")
-                    
-                    if not new_name:
-                        await websocket.send(json.dumps({
-                            "type": "error",
-                            "message": "Missing new_name parameter"
-                        }))
-                        return
-                    
-                    if orchestrator.database_manager:
-                        # Prefer using person_id from orchestrator if available (more reliable)
-                        person_id = orchestrator.conversation_state.current_person_id
-                        if person_id:
-                            orchestrator.database_manager.update_person_name(person_id, new_name)
-                            await websocket.send(json.dumps({
-                                "type": "change_name_response",
-                                "success": True,
-                                "message": f"Updated name to '{new_name}'"
-                            }))
-                            print(f"[WebSocket] Updated person name to '{new_name}' for person_id {person_id}")
-                        elif person_name:
-                            # Fallback to person_name matching if person_id not available
-                            orchestrator.database_manager.update_person_name_by_name(person_name, new_name)
-                            await websocket.send(json.dumps({
-                                "type": "change_name_response",
-                                "success": True,
-                                "message": f"Updated name from '{person_name}' to '{new_name}'"
-                            }))
-                            print(f"[WebSocket] Updated person name from '{person_name}' to '{new_name}'")
-                        else:
-                            await websocket.send(json.dumps({
-                                "type": "error",
-                                "message": "No person_id or person_name provided"
-                            }))
-                    else:
-                        await websocket.send(json.dumps({
-                            "type": "error",
-                            "message": "Database manager not available"
-                        }))
-                except ValueError as e:
-                    await websocket.send(json.dumps({
-                        "type": "error",
-                        "message": str(e)
-                    }))
-                    print(f"[WebSocket] Error updating person name: {e}")
-                except Exception as e:
-                    await websocket.send(json.dumps({
-                        "type": "error",
-                        "message": f"Failed to update person name: {str(e)}"
-                    }))
-                    print(f"[WebSocket] Error updating person name: {e}")
-            else:
-                print(f"[WebSocket] Unknown control message type: {msg_type}")
-                try:
-                    await websocket.send(json.dumps({
-                        "type": "error",
-                        "message": f"Unknown message type: {msg_type}"
-                    }))
-                except Exception as e:
-                    print(f"[WebSocket] Error sending error response: {e}")
+            handler = self._control_handlers.get(msg_type, self._on_unknown_control_message)
+            await handler(websocket, orchestrator, data)
         except websockets.exceptions.ConnectionClosed:
-            print("[WebSocket] Connection closed while handling control message")
+            log.info("Connection closed while handling control message")
         except Exception as e:
-            print(f"[WebSocket] Unexpected error handling control message: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Unexpected error handling control message: %s", e)
             try:
-                await websocket.send(json.dumps({
+                await websocket.send(_dumps({
                     "type": "error",
                     "message": f"Internal server error: {str(e)}"
                 }))
             except Exception:
                 pass  # Connection may be closed
     
-    async def _send_notification(self, websocket: WebSocketServerProtocol, title: str, message: str):
+    async def _on_ping(self, websocket: ServerConnection, orchestrator: ConversationOrchestrator, data: dict):
+        """Handle 'ping' control message."""
+        try:
+            await websocket.send(PONG_MESSAGE)
+        except Exception as e:
+            log.error("Error sending pong: %s", e)
+    
+    async def _on_set_interaction_id(self, websocket: ServerConnection, orchestrator: ConversationOrchestrator, data: dict):
+        """Handle 'set_interaction_id' control message."""
+        try:
+            interaction_id = data.get("interaction_id")
+            if not interaction_id:
+                log.warning("set_interaction_id called with empty ID")
+            if orchestrator and hasattr(orchestrator, 'conversation_state'):
+                orchestrator.conversation_state.conversation_id = interaction_id
+                log.info("Interaction ID set to: %s", interaction_id)
+            else:
+                log.warning("Orchestrator or conversation_state not available")
+        except AttributeError as e:
+            log.error("Orchestrator missing conversation_state: %s", e)
+        except Exception as e:
+            log.error("Error setting interaction ID: %s", e)
+    
+    async def _on_change_name(self, websocket: ServerConnection, orchestrator: ConversationOrchestrator, data: dict):
+        """Handle 'change_name' control message."""
+        try:
+            person_name = data.get("person_name")
+            new_name = data.get("new_name")
+            
+            if not new_name:
+                await websocket.send(MISSING_NEW_NAME_MESSAGE)
+                return
+            
+            if orchestrator.database_manager:
+                # Prefer using person_id from orchestrator if available (more reliable)
+                person_id = orchestrator.conversation_state.current_person_id
+                # Database writes block on the network, so they run off the event loop
+                if person_id:
+                    await asyncio.to_thread(orchestrator.database_manager.update_person_name, person_id, new_name)
+                    self._invalidate_person_cache(person_id)
+                    await websocket.send(_dumps({
+                        "type": "change_name_response",
+                        "success": True,
+                        "message": f"Updated name to '{new_name}'"
+                    }))
+                    log.info("Updated person name to '%s' for person_id %s", new_name, person_id)
+                elif person_name:
+                    # Fallback to person_name matching if person_id not available
+                    await asyncio.to_thread(orchestrator.database_manager.update_person_name_by_name, person_name, new_name)
+                    self._invalidate_person_cache()
+                    await websocket.send(_dumps({
+                        "type": "change_name_response",
+                        "success": True,
+                        "message": f"Updated name from '{person_name}' to '{new_name}'"
+                    }))
+                    log.info("Updated person name from '%s' to '%s'", person_name, new_name)
+                else:
+                    await websocket.send(NO_PERSON_MESSAGE)
+            else:
+                await websocket.send(NO_DATABASE_MESSAGE)
+        except ValueError as e:
+            await websocket.send(_dumps({
+                "type": "error",
+                "message": str(e)
+            }))
+            log.error("Error updating person name: %s", e)
+        except Exception as e:
+            await websocket.send(_dumps({
+                "type": "error",
+                "message": f"Failed to update person name: {str(e)}"
+            }))
+            log.error("Error updating person name: %s", e)
+    
+    async def _on_unknown_control_message(self, websocket: ServerConnection, orchestrator: ConversationOrchestrator, data: dict):
+        """Handle control messages with an unrecognized type."""
+        msg_type = data.get("type")
+        log.warning("Unknown control message type: %s", msg_type)
+        try:
+            await websocket.send(_dumps({
+                "type": "error",
+                "message": f"Unknown message type: {msg_type}"
+            }))
+        except Exception as e:
+            log.error("Error sending error response: %s", e)
+    
+    async def _send_notification(self, websocket: ServerConnection, title: str, message: str):
         """Send notification message to client.
         
         Args:
@@ -1041,11 +1543,11 @@ class WebSocketServer:
             message: Notification message
         """
         if not websocket:
-            print("[WebSocket] Error: No websocket connection for notification")
+            log.error("No websocket connection for notification")
             return
         
         if not title or not message:
-            print(f"[WebSocket] Warning: Invalid notification (title={title}, message={message})")
+            log.warning("Invalid notification (title=%s, message=%s)", title, message)
             return
         
         try:
@@ -1054,18 +1556,16 @@ class WebSocketServer:
                 "title": str(title),
                 "message": str(message)
             }
-            await websocket.send(json.dumps(payload))
-            print(f"[WebSocket] Sent notification: {title} - {message}")
+            await websocket.send(_dumps(payload))
+            log.info("Sent notification: %s - %s", title, message)
         except websockets.exceptions.ConnectionClosed:
-            print("[WebSocket] Connection closed while sending notification")
+            log.info("Connection closed while sending notification")
         except TypeError as e:
-            print(f"[WebSocket] Error serializing notification: {e}")
+            log.error("Error serializing notification: %s", e)
         except Exception as e:
-            print(f"[WebSocket] Error sending notification: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Error sending notification: %s", e)
     
-    async def _send_person_switch(self, websocket: WebSocketServerProtocol, person_id: Optional[str], person_name: Optional[str], recap: Optional[str] = None):
+    async def _send_person_switch(self, websocket: ServerConnection, person_id: Optional[str], person_name: Optional[str], recap: Optional[str] = None):
         """Send person switch message to client.
         
         Args:
@@ -1075,105 +1575,164 @@ class WebSocketServer:
             recap: Recap text (latest summary for the person) - displayed as description on lines 2-3
         """
         if not websocket:
-            print("[WebSocket] Error: No websocket connection for person switch")
+            log.error("No websocket connection for person switch")
             return
         
         try:
-            # Differentiate between "no person detected" and "unknown person detected"
-            if person_id is None:
-                # No person detected
-                display_name = "No person detected"
-            else:
-                # Person detected - use person_name or "Unknown" if not set
-                display_name = person_name or "Unknown"
-            
-            payload = {
-                "type": "switch_interaction_person",
-                "person_id": person_id,
-                "person_name": str(display_name),
-                "blurb": f"Last seen: 5 min ago" if not recap else None,  # Fallback if no recap
-                "recap": str(recap) if recap else None  # Description/recap to display on lines 2-3
-            }
-            await websocket.send(json.dumps(payload))
-            print(f"[WebSocket] ✅ Sent person switch: {display_name} ({person_id})")
+            display_name, message = _person_switch_message(person_id, person_name, recap)
+            await websocket.send(message)
+            log.info("✅ Sent person switch: %s (%s)", display_name, person_id)
         except websockets.exceptions.ConnectionClosed:
-            print("[WebSocket] Connection closed while sending person switch")
+            log.info("Connection closed while sending person switch")
         except TypeError as e:
-            print(f"[WebSocket] Error serializing person switch: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Error serializing person switch: %s", e)
         except Exception as e:
-            print(f"[WebSocket] Error sending person switch: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Error sending person switch: %s", e)
     
     async def start(self):
         """Start the WebSocket server."""
-        print(f"[WebSocket] Starting server on ws://{self.host}:{self.port}")
+        log.info("Starting server on ws://%s:%s", self.host, self.port)
         
-        # Store main event loop and create queue for person switch notifications
+        # Store main event loop and create the wakeup event for person switch notifications
         self.main_event_loop = asyncio.get_event_loop()
-        self.person_switch_queue = asyncio.Queue()
+        self._person_switch_ready = asyncio.Event()
         
-        # Background task to process person switch notifications from ESP32 thread
-        async def process_person_switch_queue():
+        # Background task to broadcast person switch notifications from ESP32 thread
+        async def process_person_switches():
             while True:
-                try:
-                    person_id, person_name, recap = await self.person_switch_queue.get()
-                    # Send to all connected clients
-                    for connection_id, conn_info in list(self.connections.items()):
-                        websocket = conn_info.get("websocket")
-                        if websocket:
-                            try:
-                                await self._send_person_switch(websocket, person_id, person_name, recap)
-                            except Exception as e:
-                                print(f"[WebSocket] Error sending person switch to {connection_id}: {e}")
-                    self.person_switch_queue.task_done()
-                except asyncio.CancelledError:
-                    break
-                except Exception as e:
-                    print(f"[WebSocket] Error processing person switch queue: {e}")
+                await self._person_switch_ready.wait()
+                self._person_switch_ready.clear()
+                self._broadcast_pending_person_switch()
+        
+        # Shut down on SIGINT/SIGTERM from inside the loop so cleanup runs in order
+        loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self._on_stop_signal)
+            except (NotImplementedError, RuntimeError):
+                # Not supported on Windows; KeyboardInterrupt cancels start() instead
+                pass
+        
+        # No permessage-deflate: inbound traffic is raw PCM audio (barely compressible) and outbound
+        # messages are small JSON, so per-connection zlib contexts would cost memory and CPU for nothing
+        async with serve(self.handle_connection, self.host, self.port, compression=None):
+            try:
+                # Background tasks are scoped to the task group: it cancels and joins them on any exit
+                async with asyncio.TaskGroup() as task_group:
+                    person_switch_task = task_group.create_task(process_person_switches())
+                    # Bring up the ESP32 in a worker thread so clients can connect while it negotiates
+                    esp32_bringup_task = task_group.create_task(asyncio.to_thread(self._bringup_esp32))
+                    
+                    await self._stop_event.wait()  # Run until signalled or request_stop()
+                    log.info("Shutting down...")
+                    
+                    # Let an in-flight bring-up finish so it doesn't start processing after we stop
+                    # (it can't be interrupted; a second signal forces an exit, see _on_stop_signal)
+                    await esp32_bringup_task
+                    
+                    # Stop ESP32 threads first so nothing new is queued, then flush the pending switch
+                    await asyncio.to_thread(self.stop_esp32_processing)
+                    person_switch_task.cancel()
+                    self._broadcast_pending_person_switch()
+            finally:
+                # Shutdown by cancellation skips the orderly path above. Stopping joins threads, so it
+                # runs off the loop, shielded so a further cancellation can't abandon it halfway
+                if not self.esp32_stop_flag.is_set():
+                    await asyncio.shield(asyncio.to_thread(self.stop_esp32_processing))
+                self._close_database_manager()
+    
+    def _on_stop_signal(self) -> None:
+        """Handle SIGINT/SIGTERM: shut down gracefully, or exit immediately if already shutting down.
+        
+        Graceful shutdown waits for an in-flight ESP32 bring-up, which blocks in BLE/WiFi calls
+        that can't be cancelled, so a second signal is the way out of a hung bring-up.
+        """
+        if not self._stop_event.is_set():
+            log.info("Stop requested (signal again to force exit)")
+            self._stop_event.set()
+            return
+        
+        log.warning("Second stop signal, exiting without waiting for shutdown")
+        if self._log_listener:
+            self._log_listener.stop()
+        # sys.exit would still wait for the blocked bring-up thread
+        os._exit(130)
+    
+    def request_stop(self) -> None:
+        """Ask a running server to shut down gracefully (safe to call from any thread)."""
+        if self._stop_event and self.main_event_loop:
+            self.main_event_loop.call_soon_threadsafe(self._stop_event.set)
+    
+    def _set_pending_person_switch(self, event: Tuple[Optional[str], str, str]) -> None:
+        """Record a person switch for broadcast, replacing any not yet sent (must run on the loop thread).
         
-        # Start background task
-        person_switch_task = asyncio.create_task(process_person_switch_queue())
+        Args:
+            event: (person_id, display_name, serialized message)
+        """
+        self._pending_person_switch.append(event)
+        self._person_switch_ready.set()
+    
+    def _broadcast_pending_person_switch(self) -> None:
+        """Broadcast the pending person switch (if any) to all connected clients."""
+        if not self._pending_person_switch:
+            return
+        
+        # Each switch replaces what the client shows, so only the latest one is kept and sent
+        person_id, display_name, message = self._pending_person_switch.popleft()
+        try:
+            # Write the same pre-encoded frame to every client without awaiting
+            # each one's drain, so one slow client doesn't stall the rest
+            targets = self._websockets_snapshot
+            broadcast(targets, message)
+            log.info("✅ Broadcast person switch: %s (%s) to %s client(s)", display_name, person_id, len(targets))
+        except Exception as e:
+            log.error("Error broadcasting person switch: %s", e)
+    
+    def _bringup_esp32(self):
+        """Set up the ESP32 connection and start frame processing (blocking, runs in a worker thread)."""
+        if self._cpu_affinity:
+            # This thread inherited the loop's core; unpin it so the threads it starts don't
+            # share that core (face recognition is pinned explicitly)
+            _set_thread_affinity(self._cpu_affinity[0])
         
-        # Set up ESP32 connection before starting server
-        print("[WebSocket] Attempting to set up ESP32 connection...")
+        log.info("Attempting to set up ESP32 connection...")
         try:
             if self.setup_esp32_connection():
                 # Start ESP32 frame processing
-                print("[WebSocket] ESP32 connection successful, starting frame processing...")
+                log.info("ESP32 connection successful, starting frame processing...")
                 self.start_esp32_processing()
             else:
-                print("[WebSocket] Warning: ESP32 connection failed, continuing without facial recognition")
+                log.warning("ESP32 connection failed, continuing without facial recognition")
         except Exception as e:
-            print(f"[WebSocket] Exception during ESP32 setup: {e}")
-            import traceback
-            traceback.print_exc()
-            print("[WebSocket] Continuing without ESP32 connection...")
-        
-        async with serve(self.handle_connection, self.host, self.port):
-            try:
-                await asyncio.Future()  # Run forever
-            finally:
-                # Cancel background task on shutdown
-                person_switch_task.cancel()
-                try:
-                    await person_switch_task
-                except asyncio.CancelledError:
-                    pass
+            log.exception("Exception during ESP32 setup: %s", e)
+            log.info("Continuing without ESP32 connection...")
     
     def run(self):
         """Run the WebSocket server (blocking)."""
         # Suppress noisy handshake errors from websockets library
-        import logging
         logging.getLogger("websockets.server").setLevel(logging.ERROR)
+        self._log_listener = _start_log_listener()
+        
+        if PIN_CPUS and hasattr(os, "sched_getaffinity"):
+            all_cpus = os.sched_getaffinity(0)
+            if len(all_cpus) >= 2:
+                loop_cpu = min(all_cpus)
+                recognition_cpus = all_cpus - {loop_cpu}
+                self._cpu_affinity = (all_cpus, {loop_cpu}, recognition_cpus)
+                _set_thread_affinity({loop_cpu})
+                log.info("Pinned event loop to CPU %s and face recognition to CPUs %s (nice %s)", loop_cpu, sorted(recognition_cpus), RECOGNITION_WORKER_NICE)
         
         try:
-            asyncio.run(self.start())
-        except KeyboardInterrupt:
-            print("\n[WebSocket] Shutting down...")
-            self.stop_esp32_processing()
+            # Signals are handled inside start(), which also stops ESP32 processing
+            if UVLOOP_AVAILABLE:
+                with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+                    runner.run(self.start())
+            else:
+                asyncio.run(self.start())
+        finally:
+            self._log_listener.stop()
+            self._log_listener = None
 
 
 if __name__ == "__main__":